@@ -27,10 +27,14 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # Short expiration - 15 minutes
     REFRESH_TOKEN_EXPIRE_DAYS: int = 1  # 1 day only
     
+    # Password hashing - bcrypt work factor (2^rounds iterations)
+    BCRYPT_ROUNDS: int = 10
+    
     # Admin
     ADMIN_EMAILS: str = "admin@example.com"
     
     # Redis
+    ENABLE_REDIS: bool = False
     REDIS_URL: str = "redis://localhost:6379/0"
     
     # CORS
@@ -68,11 +72,33 @@ class Settings(BaseSettings):
     # Performance
     ENABLE_RESPONSE_COMPRESSION: bool = True
     CACHE_TTL: int = 300  # seconds
+    SYSTEM_METRICS_INTERVAL: int = 5  # seconds between psutil samples
+    STATS_REFRESH_INTERVAL: int = 5  # seconds between collection count refreshes
+    BLOCKLIST_REFRESH_INTERVAL: int = 60  # seconds between blocked-IP snapshot reloads
     
     class Config:
         env_file = ".env"
         case_sensitive = True
     
+    @property
+    def mongodb_url(self) -> str:
+        """MongoDB URL: MONGODB_URL when set (env or .env), else DATABASE_URL."""
+        if "MONGODB_URL" in self.model_fields_set:
+            return self.MONGODB_URL
+        return self.DATABASE_URL
+    
+    @property
+    def mongodb_compressors(self) -> str:
+        """
+        Wire compressors for MongoDB clients: zstd when the zstandard
+        module is installed, stdlib zlib otherwise.
+        """
+        try:
+            import zstandard  # noqa: F401
+            return "zstd,zlib"
+        except ImportError:
+            return "zlib"
+    
     @property
     def admin_email_list(self) -> List[str]:
         """Parse admin emails into a list."""
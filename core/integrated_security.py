@@ -13,6 +13,9 @@ from core.auto_blocker import auto_blocker
 
 logger = logging.getLogger(__name__)
 
+# Methods whose bodies are scanned for injection payloads
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
 
 class IntegratedSecurityMiddleware(BaseHTTPMiddleware):
     """
@@ -30,7 +33,7 @@ class IntegratedSecurityMiddleware(BaseHTTPMiddleware):
         # 1. Check if IP is blocked
         if auto_blocker.is_blocked(client_ip):
             block_info = auto_blocker.get_block_info(client_ip)
-            logger.warning(f"🚫 Blocked IP attempted access: {client_ip}")
+            logger.warning("🚫 Blocked IP attempted access: %s", client_ip)
             
             return JSONResponse(
                 status_code=403,
@@ -44,7 +47,7 @@ class IntegratedSecurityMiddleware(BaseHTTPMiddleware):
         # 2. Check for path traversal attempts
         if security_monitor.detect_path_traversal(client_ip, str(request.url.path)):
             # Auto-block immediately
-            auto_blocker.block_ip(
+            await auto_blocker.block_ip(
                 ip=client_ip,
                 reason="Path traversal attempt detected",
                 duration_hours=48,
@@ -57,59 +60,61 @@ class IntegratedSecurityMiddleware(BaseHTTPMiddleware):
             )
         
         # 3. Check request body for SQL injection and XSS (for POST/PUT/PATCH)
-        if request.method in ["POST", "PUT", "PATCH"]:
+        body = None
+        if request.method in BODY_METHODS:
+            # Only reading the body can fail; the scan below is plain string work
             try:
-                # Get request body as string for scanning
                 body = await request.body()
-                body_str = body.decode('utf-8', errors='ignore')
+            except Exception as e:
+                logger.error("Error reading request body: %s", e)
+        
+        if body is not None:
+            body_str = body.decode('utf-8', errors='ignore')
+            
+            # Check for SQL injection
+            if security_monitor.detect_sql_injection(
+                client_ip,
+                body_str,
+                str(request.url.path)
+            ):
+                # Auto-block immediately
+                await auto_blocker.block_ip(
+                    ip=client_ip,
+                    reason="SQL injection attempt detected",
+                    duration_hours=72,
+                    severity="critical"
+                )
                 
-                # Check for SQL injection
-                if security_monitor.detect_sql_injection(
-                    client_ip,
-                    body_str,
-                    str(request.url.path)
-                ):
-                    # Auto-block immediately
-                    auto_blocker.block_ip(
+                return JSONResponse(
+                    status_code=403,
+                    content={"detail": "Access denied"}
+                )
+            
+            # Check for XSS
+            if security_monitor.detect_xss_attempt(
+                client_ip,
+                body_str,
+                str(request.url.path)
+            ):
+                # Check if should auto-block
+                if security_monitor.should_block_ip(client_ip):
+                    await auto_blocker.block_ip(
                         ip=client_ip,
-                        reason="SQL injection attempt detected",
-                        duration_hours=72,
-                        severity="critical"
+                        reason="Multiple XSS attempts detected",
+                        duration_hours=24,
+                        severity="high"
                     )
-                    
-                    return JSONResponse(
-                        status_code=403,
-                        content={"detail": "Access denied"}
-                    )
-                
-                # Check for XSS
-                if security_monitor.detect_xss_attempt(
-                    client_ip,
-                    body_str,
-                    str(request.url.path)
-                ):
-                    # Check if should auto-block
-                    if security_monitor.should_block_ip(client_ip):
-                        auto_blocker.block_ip(
-                            ip=client_ip,
-                            reason="Multiple XSS attempts detected",
-                            duration_hours=24,
-                            severity="high"
-                        )
-                    
-                    return JSONResponse(
-                        status_code=403,
-                        content={"detail": "Access denied"}
-                    )
-                
-                # Restore body for downstream handlers
-                async def receive():
-                    return {"type": "http.request", "body": body}
-                
-                request._receive = receive
                 
-            except Exception as e:
-                logger.error(f"Error scanning request body: {e}")
+                return JSONResponse(
+                    status_code=403,
+                    content={"detail": "Access denied"}
+                )
+            
+            # Restore body for downstream handlers
+            async def receive():
+                return {"type": "http.request", "body": body}
+            
+            request._receive = receive
         
         # 4. Process request
         response = await call_next(request)
@@ -126,7 +131,7 @@ class IntegratedSecurityMiddleware(BaseHTTPMiddleware):
             
             # Auto-block if too many attempts
             if should_block:
-                auto_blocker.block_ip(
+                await auto_blocker.block_ip(
                     ip=client_ip,
                     reason="Brute force attack detected (5+ failed logins)",
                     duration_hours=1,
@@ -156,29 +161,26 @@ class SecurityEventLogger(BaseHTTPMiddleware):
     Log security-relevant requests for audit trail.
     """
     
-    SENSITIVE_ENDPOINTS = [
+    # Tuple so a single str.startswith call checks every prefix
+    SENSITIVE_ENDPOINTS = (
         "/auth/login",
         "/auth/register",
         "/auction/bid",
         "/admin/",
         "/api/security/"
-    ]
+    )
     
     async def dispatch(self, request: Request, call_next: Callable):
         # Check if this is a sensitive endpoint
-        is_sensitive = any(
-            request.url.path.startswith(path) 
-            for path in self.SENSITIVE_ENDPOINTS
-        )
+        is_sensitive = request.url.path.startswith(self.SENSITIVE_ENDPOINTS)
         
         if is_sensitive:
             client_ip = self._get_client_ip(request)
             
             # Log request
             logger.info(
-                f"🔒 Security-sensitive request: "
-                f"{request.method} {request.url.path} "
-                f"from {client_ip}"
+                "🔒 Security-sensitive request: %s %s from %s",
+                request.method, request.url.path, client_ip
             )
         
         response = await call_next(request)
@@ -3,55 +3,98 @@ Performance Optimization Middleware
 Professional-grade optimizations for real-time applications
 """
 from fastapi import Request, Response
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
 import hashlib
 import logging
 from typing import Callable
 
+from core.system_metrics import poll_interval_hint
+
 logger = logging.getLogger(__name__)
 
+# Use orjson for faster response rendering when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed.
+    Output matches JSONResponse: compact separators, UTF-8, no ASCII escaping.
+    """
+    
+    def render(self, content) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
+class PerformanceMiddleware:
     """
     Advanced performance optimization middleware
     - Response time tracking
     - ETag generation for caching
     - Preload hints for critical resources
     - Connection keep-alive optimization
+    
+    Pure ASGI (no BaseHTTPMiddleware task group per request); headers are
+    added to the http.response.start message as it goes out.
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Track response time
-        start_time = time.time()
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate response time
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(round(process_time * 1000, 2))
-        
-        # Add performance headers
-        self._add_performance_headers(response, request)
-        
-        # Log slow requests
-        if process_time > 1.0:
-            logger.warning(f"Slow request: {request.url.path} took {process_time:.2f}s")
+    # Pages that get a DNS prefetch hint
+    PREFETCH_PATHS = frozenset({"/", "/team/dashboard", "/admin", "/live"})
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Track response time (perf_counter is monotonic and high resolution)
+        start_time = time.perf_counter()
+        path = scope["path"]
+        
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # Calculate response time
+                process_time = time.perf_counter() - start_time
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(round(process_time * 1000, 2))
+                
+                # Add performance headers
+                self._add_performance_headers(headers, path)
+                
+                # Log slow requests
+                if process_time > 1.0:
+                    logger.warning("Slow request: %s took %ss", path, round(process_time, 2))
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_wrapper)
     
-    def _add_performance_headers(self, response: Response, request: Request):
+    def _add_performance_headers(self, headers: MutableHeaders, path: str):
         """Add performance optimization headers"""
         
         # Connection optimization
-        response.headers["Connection"] = "keep-alive"
-        response.headers["Keep-Alive"] = "timeout=5, max=100"
+        headers["Connection"] = "keep-alive"
+        headers["Keep-Alive"] = "timeout=5, max=100"
         
         # DNS prefetch for external resources
-        if request.url.path in ["/", "/team/dashboard", "/admin", "/live"]:
-            response.headers["X-DNS-Prefetch-Control"] = "on"
+        if path in self.PREFETCH_PATHS:
+            headers["X-DNS-Prefetch-Control"] = "on"
+        
+        # Ask polling dashboards to back off while the host is saturated
+        poll_interval = poll_interval_hint()
+        if poll_interval:
+            headers["X-Poll-Interval"] = str(poll_interval)
 
 
 class ETaggerMiddleware(BaseHTTPMiddleware):
@@ -86,25 +129,32 @@ class ETaggerMiddleware(BaseHTTPMiddleware):
         return f'"{hashlib.md5(content).hexdigest()}"'
 
 
-class ResponseCompressionOptimizer(BaseHTTPMiddleware):
+class ResponseCompressionOptimizer:
     """
     Optimize compression settings based on content type
+    
+    Scans the raw response header list once; no Headers wrapper is built
+    unless the response is actually encoded.
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Add Vary header for proper caching with compression
-        if "Content-Encoding" in response.headers:
-            response.headers["Vary"] = "Accept-Encoding"
-        
-        # Suggest compression for compressible content
-        content_type = response.headers.get("content-type", "")
-        if any(ct in content_type for ct in ["text/", "application/json", "application/javascript"]):
-            # Already handled by GZipMiddleware, just ensure proper headers
-            pass
-        
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # Add Vary header for proper caching with compression
+                for name, _ in message.get("headers", ()):
+                    if name.lower() == b"content-encoding":
+                        MutableHeaders(scope=message)["Vary"] = "Accept-Encoding"
+                        break
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
 
 
 class StaticAssetOptimizer(BaseHTTPMiddleware):
@@ -158,7 +208,7 @@ class DatabaseQueryOptimizer:
         """
         index_spec = [(field, 1) for field in fields]
         collection.create_index(index_spec, unique=unique)
-        logger.info(f"Created compound index on {collection.name}: {fields}")
+        logger.info("Created compound index on %s: %s", collection.name, fields)
     
     @staticmethod
     def add_query_hint(query: dict, index_name: str) -> dict:
@@ -170,6 +220,7 @@ class DatabaseQueryOptimizer:
 
 # Export optimizers
 __all__ = [
+    'FastJSONResponse',
     'PerformanceMiddleware',
     'ETaggerMiddleware', 
     'ResponseCompressionOptimizer',
@@ -2,11 +2,11 @@
 Advanced rate limiting for API endpoints.
 Prevents abuse and ensures fair usage.
 """
-from typing import Dict, Optional
-from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Optional
 from fastapi import HTTPException, Request, status
-from collections import defaultdict
+from collections import defaultdict, deque
 import asyncio
+import time
 
 
 class RateLimiter:
@@ -16,12 +16,14 @@ class RateLimiter:
     """
     
     def __init__(self):
-        # User-based rate limits: {user_id: [(timestamp, count)]}
-        self.user_requests: Dict[str, list] = defaultdict(list)
-        # IP-based rate limits: {ip: [(timestamp, count)]}
-        self.ip_requests: Dict[str, list] = defaultdict(list)
-        # Bid rate limits (stricter): {user_id: [timestamps]}
-        self.bid_requests: Dict[str, list] = defaultdict(list)
+        # Request times are time.monotonic() seconds, oldest first; a
+        # monotonic clock keeps windows correct across wall-clock adjustments.
+        # User-based rate limits: {user_id: deque([timestamps])}
+        self.user_requests: Dict[str, Deque[float]] = defaultdict(deque)
+        # IP-based rate limits: {ip: deque([timestamps])}
+        self.ip_requests: Dict[str, Deque[float]] = defaultdict(deque)
+        # Bid rate limits (stricter): {user_id: deque([timestamps])}
+        self.bid_requests: Dict[str, Deque[float]] = defaultdict(deque)
         # Cleanup task
         self.cleanup_task = None
         
@@ -44,8 +46,8 @@ class RateLimiter:
         Returns:
             True if within limit, raises HTTPException otherwise
         """
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=window_seconds)
+        now = time.monotonic()
+        cutoff = now - window_seconds
         
         # Select appropriate storage
         if limit_type == "bid":
@@ -55,12 +57,13 @@ class RateLimiter:
         else:
             requests = self.user_requests[identifier]
         
-        # Remove old requests
-        requests[:] = [ts for ts in requests if ts > cutoff]
+        # Remove old requests (timestamps are appended in order)
+        while requests and requests[0] <= cutoff:
+            requests.popleft()
         
         # Check limit
         if len(requests) >= limit:
-            retry_after = int((requests[0] - cutoff).total_seconds()) + 1
+            retry_after = int(requests[0] - cutoff) + 1
             
             # More user-friendly error message
             if limit_type == "ip":
@@ -121,31 +124,30 @@ class RateLimiter:
         while True:
             await asyncio.sleep(300)  # Every 5 minutes
             
-            now = datetime.now(timezone.utc)
-            cutoff = now - timedelta(minutes=10)
+            cutoff = time.monotonic() - 10 * 60
             
             # Clean user requests
             for user_id in list(self.user_requests.keys()):
-                self.user_requests[user_id] = [
-                    ts for ts in self.user_requests[user_id] if ts > cutoff
-                ]
-                if not self.user_requests[user_id]:
+                timestamps = self.user_requests[user_id]
+                while timestamps and timestamps[0] <= cutoff:
+                    timestamps.popleft()
+                if not timestamps:
                     del self.user_requests[user_id]
             
             # Clean IP requests
             for ip in list(self.ip_requests.keys()):
-                self.ip_requests[ip] = [
-                    ts for ts in self.ip_requests[ip] if ts > cutoff
-                ]
-                if not self.ip_requests[ip]:
+                timestamps = self.ip_requests[ip]
+                while timestamps and timestamps[0] <= cutoff:
+                    timestamps.popleft()
+                if not timestamps:
                     del self.ip_requests[ip]
             
             # Clean bid requests
             for user_id in list(self.bid_requests.keys()):
-                self.bid_requests[user_id] = [
-                    ts for ts in self.bid_requests[user_id] if ts > cutoff
-                ]
-                if not self.bid_requests[user_id]:
+                timestamps = self.bid_requests[user_id]
+                while timestamps and timestamps[0] <= cutoff:
+                    timestamps.popleft()
+                if not timestamps:
                     del self.bid_requests[user_id]
     
     def start_cleanup(self):
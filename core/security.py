@@ -15,7 +15,19 @@ from database import db
 
 def hash_password(password: str) -> str:
     """Hash a plain password using bcrypt."""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored bcrypt hash uses a different work factor
+    than the configured one (hash format: $2b$<cost>$...).
+    """
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -134,7 +146,10 @@ def get_current_user(
     if token_role == "team":
         # Fetch team from database
         try:
-            team = db.teams.find_one({"_id": ObjectId(user_id)})
+            team = db.teams.find_one(
+                {"_id": ObjectId(user_id)},
+                {"username": 1, "name": 1}
+            )
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -158,7 +173,10 @@ def get_current_user(
     else:
         # Fetch user from database
         try:
-            user = db.users.find_one({"_id": ObjectId(user_id), "is_active": True})
+            user = db.users.find_one(
+                {"_id": ObjectId(user_id), "is_active": True},
+                {"email": 1, "name": 1, "is_admin": 1, "team_id": 1, "role": 1}
+            )
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -2,12 +2,13 @@
 Strict Session Management
 No auto-login, force re-authentication, short token expiration.
 """
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from fastapi import Request, Response, HTTPException, status
 import secrets
+import asyncio
 import hashlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -22,15 +23,25 @@ class SessionManager:
     - Session invalidation on logout
     """
     
-    # Active sessions: {session_id: {user_id, created_at, last_activity, ip, user_agent}}
-    active_sessions: Dict[str, Dict[str, Any]] = {}
+    # Active sessions, split into shards by session ID hash:
+    # [{session_id: {user_id, created_at_ts, last_activity_ts, ip, user_agent}}, ...]
+    # Timestamps are epoch seconds (time.time())
+    SESSION_SHARD_COUNT = 16  # Must be a power of two
+    session_shards: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(SESSION_SHARD_COUNT)]
     
-    # Blacklisted tokens (logged out)
+    # Blacklisted tokens (logged out), stored as 16-byte BLAKE2b digests
     blacklisted_tokens: set = set()
     
     # Session settings
     SESSION_TIMEOUT_MINUTES = 30  # Auto logout after 30 minutes of inactivity
     MAX_SESSION_DURATION_HOURS = 8  # Force logout after 8 hours
+    SESSION_TIMEOUT_SECONDS = SESSION_TIMEOUT_MINUTES * 60
+    MAX_SESSION_DURATION_SECONDS = MAX_SESSION_DURATION_HOURS * 3600
+    
+    @staticmethod
+    def _shard(session_id: str) -> Dict[str, Dict[str, Any]]:
+        """Return the shard holding the given session ID."""
+        return SessionManager.session_shards[hash(session_id) & (SessionManager.SESSION_SHARD_COUNT - 1)]
     
     @staticmethod
     def create_session(user_id: str, request: Request) -> str:
@@ -39,16 +50,17 @@ class SessionManager:
         Returns session ID.
         """
         session_id = secrets.token_urlsafe(32)
+        now = time.time()
         
-        SessionManager.active_sessions[session_id] = {
+        SessionManager._shard(session_id)[session_id] = {
             "user_id": user_id,
-            "created_at": datetime.now(timezone.utc),
-            "last_activity": datetime.now(timezone.utc),
+            "created_at_ts": now,
+            "last_activity_ts": now,
             "ip": request.client.host if request.client else "unknown",
             "user_agent": request.headers.get("user-agent", "unknown")
         }
         
-        logger.info(f"Session created: {session_id[:8]}... for user {user_id}")
+        logger.info("Session created: %s... for user %s", session_id[:8], user_id)
         return session_id
     
     @staticmethod
@@ -57,23 +69,24 @@ class SessionManager:
         Validate session and return user_id if valid.
         Returns None if invalid or expired.
         """
-        if not session_id or session_id not in SessionManager.active_sessions:
+        if not session_id:
             return None
         
-        session = SessionManager.active_sessions[session_id]
-        now = datetime.now(timezone.utc)
+        session = SessionManager._shard(session_id).get(session_id)
+        if session is None:
+            return None
+        
+        now = time.time()
         
         # Check if session expired due to inactivity
-        last_activity = session["last_activity"]
-        if now - last_activity > timedelta(minutes=SessionManager.SESSION_TIMEOUT_MINUTES):
-            logger.info(f"Session expired (inactivity): {session_id[:8]}...")
+        if now - session["last_activity_ts"] > SessionManager.SESSION_TIMEOUT_SECONDS:
+            logger.info("Session expired (inactivity): %s...", session_id[:8])
             SessionManager.destroy_session(session_id)
             return None
         
         # Check if session exceeded maximum duration
-        created_at = session["created_at"]
-        if now - created_at > timedelta(hours=SessionManager.MAX_SESSION_DURATION_HOURS):
-            logger.info(f"Session expired (max duration): {session_id[:8]}...")
+        if now - session["created_at_ts"] > SessionManager.MAX_SESSION_DURATION_SECONDS:
+            logger.info("Session expired (max duration): %s...", session_id[:8])
             SessionManager.destroy_session(session_id)
             return None
         
@@ -81,78 +94,91 @@ class SessionManager:
         current_ip = request.client.host if request.client else "unknown"
         if session["ip"] != current_ip:
             logger.warning(
-                f"Session IP mismatch: {session_id[:8]}... "
-                f"Expected {session['ip']}, got {current_ip}"
+                "Session IP mismatch: %s... Expected %s, got %s",
+                session_id[:8], session["ip"], current_ip
             )
             SessionManager.destroy_session(session_id)
             return None
         
         # Update last activity
-        session["last_activity"] = now
+        session["last_activity_ts"] = now
         
         return session["user_id"]
     
     @staticmethod
     def destroy_session(session_id: str):
         """Destroy a session."""
-        if session_id in SessionManager.active_sessions:
-            del SessionManager.active_sessions[session_id]
-            logger.info(f"Session destroyed: {session_id[:8]}...")
+        if SessionManager._shard(session_id).pop(session_id, None) is not None:
+            logger.info("Session destroyed: %s...", session_id[:8])
     
     @staticmethod
     def destroy_all_user_sessions(user_id: str):
         """Destroy all sessions for a user."""
         sessions_to_remove = [
-            sid for sid, session in SessionManager.active_sessions.items()
+            sid
+            for shard in SessionManager.session_shards
+            for sid, session in shard.items()
             if session["user_id"] == user_id
         ]
         
         for session_id in sessions_to_remove:
             SessionManager.destroy_session(session_id)
         
-        logger.info(f"Destroyed {len(sessions_to_remove)} sessions for user {user_id}")
+        logger.info("Destroyed %s sessions for user %s", len(sessions_to_remove), user_id)
+    
+    @staticmethod
+    def _token_digest(token: str) -> bytes:
+        """Raw digest used as the blacklist key (don't store full token)."""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
     
     @staticmethod
     def blacklist_token(token: str):
         """Add token to blacklist (for logout)."""
-        # Hash token for storage (don't store full token)
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
-        SessionManager.blacklisted_tokens.add(token_hash)
-        logger.info(f"Token blacklisted: {token_hash[:8]}...")
+        token_digest = SessionManager._token_digest(token)
+        SessionManager.blacklisted_tokens.add(token_digest)
+        logger.info("Token blacklisted: %s...", token_digest.hex()[:8])
     
     @staticmethod
     def is_token_blacklisted(token: str) -> bool:
         """Check if token is blacklisted."""
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
-        return token_hash in SessionManager.blacklisted_tokens
+        return SessionManager._token_digest(token) in SessionManager.blacklisted_tokens
     
     @staticmethod
-    def cleanup_expired_sessions():
-        """Remove expired sessions (run periodically)."""
-        now = datetime.now(timezone.utc)
-        expired = []
-        
-        for session_id, session in SessionManager.active_sessions.items():
-            last_activity = session["last_activity"]
-            if now - last_activity > timedelta(minutes=SessionManager.SESSION_TIMEOUT_MINUTES):
-                expired.append(session_id)
+    async def cleanup_expired_sessions():
+        """
+        Remove expired sessions (run periodically from the event loop).
+        Yields between shards so a large sweep never stalls request handling.
+        """
+        now = time.time()
+        cleaned = 0
         
-        for session_id in expired:
-            SessionManager.destroy_session(session_id)
+        # Sweep one shard at a time; each shard is scanned and pruned
+        # without an await, so handlers never see it mid-iteration
+        for shard in SessionManager.session_shards:
+            expired = [
+                session_id for session_id, session in shard.items()
+                if now - session["last_activity_ts"] > SessionManager.SESSION_TIMEOUT_SECONDS
+            ]
+            for session_id in expired:
+                SessionManager.destroy_session(session_id)
+            cleaned += len(expired)
+            await asyncio.sleep(0)
         
-        if expired:
-            logger.info(f"Cleaned up {len(expired)} expired sessions")
+        if cleaned:
+            logger.info("Cleaned up %s expired sessions", cleaned)
     
     @staticmethod
     def get_active_session_count() -> int:
         """Get number of active sessions."""
-        return len(SessionManager.active_sessions)
+        return sum(len(shard) for shard in SessionManager.session_shards)
     
     @staticmethod
     def get_user_session_count(user_id: str) -> int:
         """Get number of active sessions for a user."""
         return sum(
-            1 for session in SessionManager.active_sessions.values()
+            1
+            for shard in SessionManager.session_shards
+            for session in shard.values()
             if session["user_id"] == user_id
         )
 
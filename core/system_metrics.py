@@ -0,0 +1,100 @@
+"""
+System resource sampling.
+Kept free of database and session imports so middleware can read the
+latest snapshot without pulling in the rest of the monitoring stack.
+"""
+import psutil
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fixed for the life of the process, so read once instead of per sample
+CPU_COUNT = psutil.cpu_count()
+
+
+def sample_system_metrics() -> Dict[str, Any]:
+    """Read system resource metrics from psutil without blocking."""
+    try:
+        # interval=None reports usage since the previous call instead of sleeping
+        cpu_percent = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        
+        return {
+            "cpu": {
+                "percent": cpu_percent,
+                "count": CPU_COUNT
+            },
+            "memory": {
+                "total_mb": round(memory.total / (1024 * 1024), 2),
+                "used_mb": round(memory.used / (1024 * 1024), 2),
+                "percent": memory.percent
+            },
+            "disk": {
+                "total_gb": round(disk.total / (1024 * 1024 * 1024), 2),
+                "used_gb": round(disk.used / (1024 * 1024 * 1024), 2),
+                "percent": disk.percent
+            }
+        }
+    except Exception as e:
+        logger.error("Error getting system metrics: %s", e)
+        return {}
+
+
+class SystemMetricsSampler:
+    """
+    Samples system metrics on a daemon thread.
+    Request handlers read the latest snapshot instead of calling psutil.
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.latest: Dict[str, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def start(self):
+        """Start the sampling thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        # Prime cpu_percent so the first interval=None reading is meaningful
+        psutil.cpu_percent(interval=None)
+        self._thread = threading.Thread(
+            target=self._run, name="system-metrics-sampler", daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the sampling thread."""
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # Rebind rather than mutate so readers always see a whole snapshot
+            self.latest = sample_system_metrics()
+
+
+system_sampler = SystemMetricsSampler(settings.SYSTEM_METRICS_INTERVAL)
+
+
+def get_system_metrics() -> Dict[str, Any]:
+    """Get the latest system resource metrics."""
+    return system_sampler.latest or sample_system_metrics()
+
+
+# Above this CPU load, polling dashboards are asked to slow down
+POLL_BACKOFF_CPU_PERCENT = 80
+POLL_BACKOFF_INTERVAL_MS = 60000
+
+
+def poll_interval_hint() -> Optional[int]:
+    """Poll interval (ms) to advertise to clients, or None when not saturated."""
+    cpu_percent = system_sampler.latest.get("cpu", {}).get("percent", 0)
+    if cpu_percent > POLL_BACKOFF_CPU_PERCENT:
+        return POLL_BACKOFF_INTERVAL_MS
+    return None
@@ -149,13 +149,13 @@ class PricePredictionModel:
         ) * age_factor
         
         # Confidence based on data completeness
-        data_points = sum([
-            batting_average > 0,
-            strike_rate > 0,
-            wickets > 0,
-            matches_played > 0,
-            previous_price > 0
-        ])
+        data_points = (
+            (batting_average > 0) +
+            (strike_rate > 0) +
+            (wickets > 0) +
+            (matches_played > 0) +
+            (previous_price > 0)
+        )
         confidence = min(0.5 + (data_points * 0.1), 0.9)
         
         return {
@@ -23,28 +23,34 @@ class AuctionAnalytics:
             Dictionary with auction statistics
         """
         try:
-            # Total players
-            total_players = db.players.count_documents({})
-            sold_players = db.players.count_documents({"status": "sold"})
-            unsold_players = db.players.count_documents({"status": "unsold"})
-            
-            # Revenue calculation
-            revenue_pipeline = [
-                {"$match": {"status": "sold", "final_bid": {"$exists": True}}},
+            # Player counts and revenue statistics in a single pass
+            sold_bid = {"$cond": [
+                {"$and": [{"$eq": ["$status", "sold"]}, {"$ne": [{"$type": "$final_bid"}, "missing"]}]},
+                "$final_bid",
+                None
+            ]}
+            summary_pipeline = [
                 {"$group": {
                     "_id": None,
-                    "total_revenue": {"$sum": "$final_bid"},
-                    "avg_price": {"$avg": "$final_bid"},
-                    "max_price": {"$max": "$final_bid"},
-                    "min_price": {"$min": "$final_bid"}
+                    "total_players": {"$sum": 1},
+                    "sold_players": {"$sum": {"$cond": [{"$eq": ["$status", "sold"]}, 1, 0]}},
+                    "unsold_players": {"$sum": {"$cond": [{"$eq": ["$status", "unsold"]}, 1, 0]}},
+                    "total_revenue": {"$sum": sold_bid},
+                    "avg_price": {"$avg": sold_bid},
+                    "max_price": {"$max": sold_bid},
+                    "min_price": {"$min": sold_bid}
                 }}
             ]
-            revenue_result = list(db.players.aggregate(revenue_pipeline))
-            revenue_data = revenue_result[0] if revenue_result else {
-                "total_revenue": 0,
-                "avg_price": 0,
-                "max_price": 0,
-                "min_price": 0
+            summary_result = list(db.players.aggregate(summary_pipeline))
+            summary = summary_result[0] if summary_result else {}
+            total_players = summary.get("total_players", 0)
+            sold_players = summary.get("sold_players", 0)
+            unsold_players = summary.get("unsold_players", 0)
+            revenue_data = {
+                "total_revenue": summary.get("total_revenue") or 0,
+                "avg_price": summary.get("avg_price") or 0,
+                "max_price": summary.get("max_price") or 0,
+                "min_price": summary.get("min_price") or 0
             }
             
             # Most expensive player
@@ -54,7 +60,7 @@ class AuctionAnalytics:
             )
             
             # Total bids
-            total_bids = db.bid_history.count_documents({})
+            total_bids = db.bid_history.estimated_document_count()
             
             return {
                 "ok": True,
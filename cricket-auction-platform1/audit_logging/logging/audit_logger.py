@@ -313,7 +313,7 @@ class AuditLogger:
             event_counts = list(db.audit_logs.aggregate(pipeline))
             
             # Total logs
-            total_logs = db.audit_logs.count_documents({})
+            total_logs = db.audit_logs.estimated_document_count()
             
             # Recent activity (last 24 hours)
             from datetime import timedelta
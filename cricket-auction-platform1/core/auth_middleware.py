@@ -46,17 +46,17 @@ class StrictAuthMiddleware(BaseHTTPMiddleware):
         auth_header = request.headers.get("authorization", "")
         if auth_header.lower().startswith("bearer "):
             token = auth_header.split(" ", 1)[1]
-            logger.debug(f"Token from Authorization header for {request.url.path}")
+            logger.debug("Token from Authorization header for %s", request.url.path)
         
         # 2. Cookie (for web pages)
         if not token:
             token = request.cookies.get("access_token")
             if token:
-                logger.debug(f"Token from cookie for {request.url.path}")
+                logger.debug("Token from cookie for %s", request.url.path)
         
         # If no token, check if route requires authentication
         if not token:
-            logger.warning(f"No token found for {request.url.path}")
+            logger.warning("No token found for %s", request.url.path)
             # Check if this route is protected
             required_roles = RouteGuard.get_required_roles(request.url.path)
             if required_roles:
@@ -67,7 +67,7 @@ class StrictAuthMiddleware(BaseHTTPMiddleware):
                         content={"detail": "Authentication required"}
                     )
                 else:
-                    logger.warning(f"Redirecting {request.url.path} to login (no token)")
+                    logger.warning("Redirecting %s to login (no token)", request.url.path)
                     return RedirectResponse(
                         url="/?error=login_required",
                         status_code=303
@@ -107,13 +107,16 @@ class StrictAuthMiddleware(BaseHTTPMiddleware):
             if token_role == "team":
                 # This is a team token - fetch from teams collection
                 try:
-                    team = db.teams.find_one({"_id": ObjectId(user_id)})
+                    team = db.teams.find_one(
+                        {"_id": ObjectId(user_id)},
+                        {"username": 1}
+                    )
                 except Exception:
-                    logger.error(f"Invalid team ID format: {user_id}")
+                    logger.error("Invalid team ID format: %s", user_id)
                     return self._handle_invalid_auth(request)
                 
                 if not team:
-                    logger.warning(f"Team not found: {user_id}")
+                    logger.warning("Team not found: %s", user_id)
                     return self._handle_invalid_auth(request)
                 
                 # Set team info in request state
@@ -126,16 +129,16 @@ class StrictAuthMiddleware(BaseHTTPMiddleware):
             else:
                 # This is a user token - fetch from users collection
                 try:
-                    user = db.users.find_one({
-                        "_id": ObjectId(user_id),
-                        "is_active": True
-                    })
+                    user = db.users.find_one(
+                        {"_id": ObjectId(user_id), "is_active": True},
+                        {"email": 1, "role": 1, "is_admin": 1}
+                    )
                 except Exception:
-                    logger.error(f"Invalid user ID format: {user_id}")
+                    logger.error("Invalid user ID format: %s", user_id)
                     return self._handle_invalid_auth(request)
                 
                 if not user:
-                    logger.warning(f"User not found or inactive: {user_id}")
+                    logger.warning("User not found or inactive: %s", user_id)
                     return self._handle_invalid_auth(request)
                 
                 # Set user info in request state
@@ -159,10 +162,10 @@ class StrictAuthMiddleware(BaseHTTPMiddleware):
             return response
             
         except JWTError as e:
-            logger.warning(f"JWT validation error: {e}")
+            logger.warning("JWT validation error: %s", e)
             return self._handle_invalid_auth(request)
         except Exception as e:
-            logger.error(f"Authentication error: {e}")
+            logger.error("Authentication error: %s", e)
             return self._handle_invalid_auth(request)
     
     def _handle_invalid_auth(self, request: Request):
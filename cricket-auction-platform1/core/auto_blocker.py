@@ -4,6 +4,7 @@ Blocks malicious IPs based on security violations.
 """
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict
+import asyncio
 import logging
 
 from database import db
@@ -15,27 +16,49 @@ class AutoBlocker:
     """
     Automatic IP blocking system.
     Blocks IPs after repeated security violations.
+
+    ``blocked_ips`` is an immutable snapshot; ``is_blocked`` reads it
+    without locking and never touches the database. Reloads and local
+    block_ip/unblock_ip calls replace it under ``_lock``, which a reload
+    holds from its database read until the swap, so a block made on this
+    worker mid-reload is applied after the swap rather than lost.
+
+    Blocks written by other workers (or directly in the database) and
+    expiries only take effect here on the next periodic reload, i.e.
+    after up to BLOCKLIST_REFRESH_INTERVAL seconds.
     """
     
     def __init__(self):
-        self.blocked_ips = set()
-        self.load_blocked_ips()
+        self.blocked_ips: frozenset = frozenset()
+        self._lock = asyncio.Lock()
+        # Initial load at import, before the event loop runs
+        try:
+            self.blocked_ips = self._fetch_blocked_ips()
+        except Exception as e:
+            logger.error(f"Error loading blocked IPs: {e}")
+    
+    def _fetch_blocked_ips(self) -> frozenset:
+        """Read unexpired blocked IPs from the database (blocking)."""
+        blocked = db.blocked_ips.find(
+            {"expires_at": {"$gt": datetime.now(timezone.utc)}},
+            {"ip": 1, "_id": 0}
+        )
+        return frozenset(block["ip"] for block in blocked)
     
-    def load_blocked_ips(self):
-        """Load currently blocked IPs from database."""
+    async def load_blocked_ips(self):
+        """Reload the blocked-IP snapshot from the database."""
         try:
-            blocked = db.blocked_ips.find({
-                "expires_at": {"$gt": datetime.now(timezone.utc)}
-            })
-            
-            for block in blocked:
-                self.blocked_ips.add(block["ip"])
+            async with self._lock:
+                snapshot = await asyncio.to_thread(self._fetch_blocked_ips)
+                changed = snapshot != self.blocked_ips
+                self.blocked_ips = snapshot
             
-            logger.info(f"Loaded {len(self.blocked_ips)} blocked IPs")
+            if changed:
+                logger.info(f"Loaded {len(snapshot)} blocked IPs")
         except Exception as e:
             logger.error(f"Error loading blocked IPs: {e}")
     
-    def block_ip(
+    async def block_ip(
         self,
         ip: str,
         reason: str,
@@ -54,12 +77,9 @@ class AutoBlocker:
         now = datetime.now(timezone.utc)
         expires_at = now + timedelta(hours=duration_hours)
         
-        # Add to memory
-        self.blocked_ips.add(ip)
-        
-        # Add to database
+        # Add to database first, so any later reload includes it
         try:
-            db.blocked_ips.insert_one({
+            await asyncio.to_thread(db.blocked_ips.insert_one, {
                 "ip": ip,
                 "reason": reason,
                 "severity": severity,
@@ -76,6 +96,10 @@ class AutoBlocker:
             )
         except Exception as e:
             logger.error(f"Error blocking IP {ip}: {e}")
+        
+        # Add to memory (even if the insert failed, block on this worker)
+        async with self._lock:
+            self.blocked_ips = self.blocked_ips | {ip}
     
     def is_blocked(self, ip: str) -> bool:
         """
@@ -87,42 +111,26 @@ class AutoBlocker:
         Returns:
             True if blocked, False otherwise
         """
-        # Check memory first (fast)
-        if ip in self.blocked_ips:
-            return True
-        
-        # Check database (slower but authoritative)
-        try:
-            block = db.blocked_ips.find_one({
-                "ip": ip,
-                "expires_at": {"$gt": datetime.now(timezone.utc)}
-            })
-            
-            if block:
-                # Add to memory for faster future checks
-                self.blocked_ips.add(ip)
-                return True
-        except Exception as e:
-            logger.error(f"Error checking blocked IP {ip}: {e}")
-        
-        return False
+        # Snapshot only: this runs on every request, on the event loop
+        return ip in self.blocked_ips
     
-    def unblock_ip(self, ip: str):
+    async def unblock_ip(self, ip: str):
         """
         Manually unblock an IP address.
         
         Args:
             ip: IP address to unblock
         """
-        # Remove from memory
-        self.blocked_ips.discard(ip)
-        
-        # Remove from database
+        # Remove from database first (see block_ip)
         try:
-            result = db.blocked_ips.delete_many({"ip": ip})
+            result = await asyncio.to_thread(db.blocked_ips.delete_many, {"ip": ip})
             logger.info(f"Unblocked IP {ip} ({result.deleted_count} records removed)")
         except Exception as e:
             logger.error(f"Error unblocking IP {ip}: {e}")
+        
+        # Remove from memory
+        async with self._lock:
+            self.blocked_ips = self.blocked_ips - {ip}
     
     def get_block_info(self, ip: str) -> Optional[Dict]:
         """
@@ -187,9 +195,6 @@ class AutoBlocker:
             
             if result.deleted_count > 0:
                 logger.info(f"Cleaned up {result.deleted_count} expired IP blocks")
-                # Reload blocked IPs
-                self.blocked_ips.clear()
-                self.load_blocked_ips()
             
             return result.deleted_count
         except Exception as e:
@@ -199,19 +204,18 @@ class AutoBlocker:
     def get_stats(self) -> Dict:
         """Get blocking statistics."""
         try:
-            total_blocks = db.blocked_ips.count_documents({})
-            active_blocks = db.blocked_ips.count_documents({
-                "expires_at": {"$gt": datetime.now(timezone.utc)}
-            })
+            total_blocks = db.blocked_ips.estimated_document_count()
             
-            # Count by severity
-            severity_counts = {}
-            for severity in ["low", "medium", "high", "critical"]:
-                count = db.blocked_ips.count_documents({
-                    "severity": severity,
-                    "expires_at": {"$gt": datetime.now(timezone.utc)}
-                })
-                severity_counts[severity] = count
+            # Count active blocks by severity in one pass
+            severity_counts = {"low": 0, "medium": 0, "high": 0, "critical": 0}
+            active_blocks = 0
+            for row in db.blocked_ips.aggregate([
+                {"$match": {"expires_at": {"$gt": datetime.now(timezone.utc)}}},
+                {"$group": {"_id": "$severity", "count": {"$sum": 1}}}
+            ]):
+                active_blocks += row["count"]
+                if row["_id"] in severity_counts:
+                    severity_counts[row["_id"]] = row["count"]
             
             return {
                 "total_blocks_all_time": total_blocks,
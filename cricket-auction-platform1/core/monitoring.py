@@ -3,60 +3,115 @@ Application monitoring and metrics.
 Provides health checks, metrics, and performance monitoring.
 """
 from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse
 from datetime import datetime, timezone
-import psutil
+import asyncio
+from collections import defaultdict
 import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+from core.config import settings
+from core.system_metrics import get_system_metrics
+from core.redis_session import redis_session_manager
+from database import db
+from database.session import ping
+from websocket.manager import manager
 
 logger = logging.getLogger(__name__)
 
 # Track application start time
 APP_START_TIME = time.time()
 
+# Scrapes and dashboard refreshes inside this window share one payload
+METRICS_CACHE_TTL_SECONDS = 5
+
+# {key: (expires_at monotonic, payload)}
+_payload_cache: Dict[str, Tuple[float, Any]] = {}
+
+# One rebuild per key at a time; waiters re-check the cache once they get in
+_payload_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def _get_cached_payload(key: str) -> Optional[Any]:
+    """Return a cached payload if it has not expired."""
+    entry = _payload_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_payload(key: str, payload: Any, ttl: float = METRICS_CACHE_TTL_SECONDS):
+    """Cache a payload for ttl seconds."""
+    _payload_cache[key] = (time.monotonic() + ttl, payload)
+
 router = APIRouter(tags=["Monitoring"])
 
+# Liveness never changes, so the response is built once and reused
+_LIVENESS_RESPONSE = JSONResponse(content={"status": "ok"})
 
-def get_system_metrics() -> Dict[str, Any]:
-    """Get system resource metrics."""
-    try:
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        return {
-            "cpu": {
-                "percent": cpu_percent,
-                "count": psutil.cpu_count()
-            },
-            "memory": {
-                "total_mb": round(memory.total / (1024 * 1024), 2),
-                "used_mb": round(memory.used / (1024 * 1024), 2),
-                "percent": memory.percent
-            },
-            "disk": {
-                "total_gb": round(disk.total / (1024 * 1024 * 1024), 2),
-                "used_gb": round(disk.used / (1024 * 1024 * 1024), 2),
-                "percent": disk.percent
-            }
-        }
-    except Exception as e:
-        logger.error(f"Error getting system metrics: {e}")
-        return {}
+
+def count_collections() -> Dict[str, int]:
+    """Count documents for the metrics and stats endpoints (blocking)."""
+    return {
+        "users": db.users.estimated_document_count(),
+        "admins": db.users.count_documents({"is_admin": True}),
+        "players": db.players.estimated_document_count(),
+        "sold_players": db.players.count_documents({"status": "sold"}),
+        "teams": db.teams.estimated_document_count(),
+        "bids": db.bid_history.estimated_document_count()
+    }
+
+
+class CollectionCountsRefresher:
+    """
+    Refreshes collection counts on a background task.
+    /metrics and /stats read the snapshot instead of querying MongoDB.
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.latest: Dict[str, int] = {}
+        self.task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the refresh task."""
+        if not self.task:
+            self.task = asyncio.create_task(self._run())
+    
+    def stop(self):
+        """Cancel the refresh task."""
+        if self.task:
+            self.task.cancel()
+            self.task = None
+    
+    async def _run(self):
+        while True:
+            try:
+                self.latest = await asyncio.to_thread(count_collections)
+            except Exception as e:
+                logger.error(f"Error refreshing collection counts: {e}")
+            await asyncio.sleep(self.interval)
+
+
+collection_counts = CollectionCountsRefresher(settings.STATS_REFRESH_INTERVAL)
+
+
+async def get_collection_counts() -> Dict[str, int]:
+    """Get the latest collection counts, counting inline before the first refresh."""
+    return collection_counts.latest or await asyncio.to_thread(count_collections)
 
 
 def check_database_health() -> Dict[str, Any]:
     """Check database connection health."""
     try:
-        from database import db
-        
         # Simple ping
-        db.command('ping')
+        ping()
         
         # Get collection counts
-        users_count = db.users.count_documents({})
-        players_count = db.players.count_documents({})
-        teams_count = db.teams.count_documents({})
+        users_count = db.users.estimated_document_count()
+        players_count = db.players.estimated_document_count()
+        teams_count = db.teams.estimated_document_count()
         
         return {
             "status": "healthy",
@@ -77,8 +132,6 @@ def check_database_health() -> Dict[str, Any]:
 def check_redis_health() -> Dict[str, Any]:
     """Check Redis connection health."""
     try:
-        from core.redis_session import redis_session_manager
-        
         if not redis_session_manager.redis_client:
             return {
                 "status": "disabled",
@@ -108,8 +161,6 @@ def check_redis_health() -> Dict[str, Any]:
 def get_websocket_metrics() -> Dict[str, Any]:
     """Get WebSocket connection metrics."""
     try:
-        from websocket.manager import manager
-        
         return {
             "active_connections": len(manager.active_connections),
             "rooms": len(manager.rooms),
@@ -121,6 +172,16 @@ def get_websocket_metrics() -> Dict[str, Any]:
         return {}
 
 
+@router.get("/healthz")
+async def liveness_check():
+    """
+    Liveness probe for load balancers.
+    Does no work beyond returning a prebuilt response; use
+    /health/detailed for component checks.
+    """
+    return _LIVENESS_RESPONSE
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -148,7 +209,7 @@ async def detailed_health_check():
         "uptime_hours": round(uptime_seconds / 3600, 2),
         "components": {
             "database": check_database_health(),
-            "redis": check_redis_health(),
+            "redis": await asyncio.to_thread(check_redis_health),
             "websocket": get_websocket_metrics()
         },
         "system": get_system_metrics()
@@ -171,29 +232,39 @@ async def metrics_endpoint():
     Prometheus-compatible metrics endpoint.
     Returns metrics in Prometheus text format.
     """
-    try:
-        from core.redis_session import redis_session_manager
-        from websocket.manager import manager
-        from database import db
-        
-        # Collect metrics
-        uptime = time.time() - APP_START_TIME
-        system = get_system_metrics()
-        
-        # Active sessions
-        active_sessions = redis_session_manager.get_active_session_count()
-        
-        # WebSocket connections
-        ws_connections = len(manager.active_connections)
-        
-        # Database counts
-        users_count = db.users.count_documents({})
-        players_count = db.players.count_documents({})
-        teams_count = db.teams.count_documents({})
-        bids_count = db.bid_history.count_documents({})
+    cached = _get_cached_payload("metrics")
+    if cached is not None:
+        return Response(content=cached, media_type="text/plain")
+    
+    # Requests arriving during a miss wait for the first rebuild instead of
+    # each starting their own Redis SCAN
+    async with _payload_locks["metrics"]:
+        cached = _get_cached_payload("metrics")
+        if cached is not None:
+            return Response(content=cached, media_type="text/plain")
         
-        # Format as Prometheus metrics
-        metrics = f"""# HELP app_uptime_seconds Application uptime in seconds
+        try:
+            # Collect metrics
+            uptime = time.time() - APP_START_TIME
+            system = get_system_metrics()
+            
+            # Active sessions (SCANs every session key, so run it off the event loop)
+            active_sessions = await asyncio.to_thread(
+                redis_session_manager.get_active_session_count
+            )
+            
+            # WebSocket connections
+            ws_connections = len(manager.active_connections)
+            
+            # Database counts
+            counts = await get_collection_counts()
+            users_count = counts["users"]
+            players_count = counts["players"]
+            teams_count = counts["teams"]
+            bids_count = counts["bids"]
+            
+            # Format as Prometheus metrics
+            metrics = f"""# HELP app_uptime_seconds Application uptime in seconds
 # TYPE app_uptime_seconds gauge
 app_uptime_seconds {uptime}
 
@@ -233,16 +304,17 @@ system_memory_percent {system.get('memory', {}).get('percent', 0)}
 # TYPE system_disk_percent gauge
 system_disk_percent {system.get('disk', {}).get('percent', 0)}
 """
-        
-        return Response(content=metrics, media_type="text/plain")
-        
-    except Exception as e:
-        logger.error(f"Error generating metrics: {e}")
-        return Response(
-            content=f"# Error generating metrics: {e}",
-            media_type="text/plain",
-            status_code=500
-        )
+            
+            _cache_payload("metrics", metrics)
+            return Response(content=metrics, media_type="text/plain")
+            
+        except Exception as e:
+            logger.error(f"Error generating metrics: {e}")
+            return Response(
+                content=f"# Error generating metrics: {e}",
+                media_type="text/plain",
+                status_code=500
+            )
 
 
 @router.get("/stats")
@@ -251,59 +323,72 @@ async def application_stats():
     Application statistics for admin dashboard.
     Returns detailed stats about the application.
     """
-    try:
-        from database import db
-        from core.redis_session import redis_session_manager
-        from websocket.manager import manager
-        
-        # Database stats
-        users_count = db.users.count_documents({})
-        admin_count = db.users.count_documents({"is_admin": True})
-        players_count = db.players.count_documents({})
-        sold_players = db.players.count_documents({"status": "sold"})
-        teams_count = db.teams.count_documents({})
-        bids_count = db.bid_history.count_documents({})
-        
-        # Session stats
-        active_sessions = redis_session_manager.get_active_session_count()
-        
-        # WebSocket stats
-        ws_connections = len(manager.active_connections)
-        ws_rooms = len(manager.rooms)
-        
-        # System stats
-        uptime = time.time() - APP_START_TIME
-        system = get_system_metrics()
-        
-        return {
-            "ok": True,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "uptime": {
-                "seconds": round(uptime, 2),
-                "hours": round(uptime / 3600, 2),
-                "days": round(uptime / 86400, 2)
-            },
-            "database": {
-                "users": users_count,
-                "admins": admin_count,
-                "players": players_count,
-                "sold_players": sold_players,
-                "teams": teams_count,
-                "total_bids": bids_count
-            },
-            "sessions": {
-                "active": active_sessions
-            },
-            "websocket": {
-                "connections": ws_connections,
-                "rooms": ws_rooms
-            },
-            "system": system
-        }
+    cached = _get_cached_payload("stats")
+    if cached is not None:
+        return cached
+    
+    # Requests arriving during a miss wait for the first rebuild instead of
+    # each starting their own Redis SCAN
+    async with _payload_locks["stats"]:
+        cached = _get_cached_payload("stats")
+        if cached is not None:
+            return cached
         
-    except Exception as e:
-        logger.error(f"Error getting application stats: {e}")
-        return {
-            "ok": False,
-            "error": str(e)
-        }
+        try:
+            # Database stats
+            counts = await get_collection_counts()
+            users_count = counts["users"]
+            admin_count = counts["admins"]
+            players_count = counts["players"]
+            sold_players = counts["sold_players"]
+            teams_count = counts["teams"]
+            bids_count = counts["bids"]
+            
+            # Session stats (SCANs every session key, so run it off the event loop)
+            active_sessions = await asyncio.to_thread(
+                redis_session_manager.get_active_session_count
+            )
+            
+            # WebSocket stats
+            ws_connections = len(manager.active_connections)
+            ws_rooms = len(manager.rooms)
+            
+            # System stats
+            uptime = time.time() - APP_START_TIME
+            system = get_system_metrics()
+            
+            stats = {
+                "ok": True,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "uptime": {
+                    "seconds": round(uptime, 2),
+                    "hours": round(uptime / 3600, 2),
+                    "days": round(uptime / 86400, 2)
+                },
+                "database": {
+                    "users": users_count,
+                    "admins": admin_count,
+                    "players": players_count,
+                    "sold_players": sold_players,
+                    "teams": teams_count,
+                    "total_bids": bids_count
+                },
+                "sessions": {
+                    "active": active_sessions
+                },
+                "websocket": {
+                    "connections": ws_connections,
+                    "rooms": ws_rooms
+                },
+                "system": system
+            }
+            
+            _cache_payload("stats", stats)
+            return stats
+            
+        except Exception as e:
+            logger.error(f"Error getting application stats: {e}")
+            return {
+                "ok": False,
+                "error": str(e)
+            }
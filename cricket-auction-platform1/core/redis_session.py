@@ -5,6 +5,8 @@ Replaces in-memory sessions with persistent Redis storage.
 import json
 import secrets
 import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from fastapi import Request
@@ -20,6 +22,36 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis not available, using in-memory sessions")
 
+# Use orjson for faster session (de)serialization when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(data: Dict[str, Any]):
+    """Serialize session data for Redis."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data)
+
+
+def _loads(data) -> Dict[str, Any]:
+    """Deserialize session data read from Redis."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Keys fetched per SCAN step and per MGET when walking all sessions
+SESSION_SCAN_BATCH = 500
+
+# In-memory fallback limits: least recently used sessions are evicted past
+# the cap, blacklist entries expire after the same 24h TTL used in Redis
+MAX_IN_MEMORY_SESSIONS = 10_000
+BLACKLIST_TTL_SECONDS = 86400
+
 
 class RedisSessionManager:
     """
@@ -29,8 +61,10 @@ class RedisSessionManager:
     
     def __init__(self):
         self.redis_client = None
-        self.in_memory_sessions = {}  # Fallback
-        self.blacklisted_tokens = set()
+        self.in_memory_sessions = OrderedDict()  # Fallback, LRU-bounded
+        self.evicted_sessions = 0
+        # {token_hash: expires_at monotonic}, in expiry order since the TTL is fixed
+        self.blacklisted_tokens = OrderedDict()
         
         # Session settings
         self.SESSION_TIMEOUT_MINUTES = 30
@@ -57,7 +91,9 @@ class RedisSessionManager:
                 redis_url,
                 decode_responses=True,
                 socket_connect_timeout=5,
-                socket_timeout=5
+                socket_timeout=5,
+                socket_keepalive=True,
+                max_connections=50
             )
             
             # Test connection
@@ -69,6 +105,29 @@ class RedisSessionManager:
             logger.warning("Falling back to in-memory sessions")
             self.redis_client = None
     
+    def _store_in_memory(self, session_id: str, session_data: Dict[str, Any]):
+        """Store a fallback session, evicting the least recently used past the cap."""
+        self.in_memory_sessions[session_id] = session_data
+        self.in_memory_sessions.move_to_end(session_id)
+        while len(self.in_memory_sessions) > MAX_IN_MEMORY_SESSIONS:
+            self.in_memory_sessions.popitem(last=False)
+            self.evicted_sessions += 1
+    
+    def _blacklist_in_memory(self, token_hash: str):
+        """Blacklist a token hash in memory with the Redis TTL."""
+        now = time.monotonic()
+        self._purge_expired_blacklist(now)
+        self.blacklisted_tokens[token_hash] = now + BLACKLIST_TTL_SECONDS
+        self.blacklisted_tokens.move_to_end(token_hash)
+    
+    def _purge_expired_blacklist(self, now: float):
+        """Drop expired blacklist entries from the front of the queue."""
+        while self.blacklisted_tokens:
+            token_hash, expires_at = next(iter(self.blacklisted_tokens.items()))
+            if expires_at > now:
+                break
+            del self.blacklisted_tokens[token_hash]
+    
     def create_session(self, user_id: str, request: Request) -> str:
         """Create a new session."""
         session_id = secrets.token_urlsafe(32)
@@ -88,15 +147,15 @@ class RedisSessionManager:
                 self.redis_client.setex(
                     key,
                     self.SESSION_TIMEOUT_MINUTES * 60,
-                    json.dumps(session_data)
+                    _dumps(session_data)
                 )
                 logger.info(f"Session created in Redis: {session_id[:8]}... for user {user_id}")
             except Exception as e:
                 logger.error(f"Redis error, falling back to memory: {e}")
-                self.in_memory_sessions[session_id] = session_data
+                self._store_in_memory(session_id, session_data)
         else:
             # Store in memory
-            self.in_memory_sessions[session_id] = session_data
+            self._store_in_memory(session_id, session_data)
             logger.info(f"Session created in memory: {session_id[:8]}... for user {user_id}")
         
         return session_id
@@ -114,7 +173,7 @@ class RedisSessionManager:
                 key = f"session:{session_id}"
                 data = self.redis_client.get(key)
                 if data:
-                    session_data = json.loads(data)
+                    session_data = _loads(data)
             except Exception as e:
                 logger.error(f"Redis error: {e}")
         
@@ -159,15 +218,32 @@ class RedisSessionManager:
                 self.redis_client.setex(
                     key,
                     self.SESSION_TIMEOUT_MINUTES * 60,
-                    json.dumps(session_data)
+                    _dumps(session_data)
                 )
             except Exception as e:
                 logger.error(f"Redis error updating session: {e}")
         else:
-            self.in_memory_sessions[session_id] = session_data
+            self._store_in_memory(session_id, session_data)
         
         return session_data["user_id"]
     
+    def _iter_redis_sessions(self):
+        """Yield (key, session_data) for every Redis session, one MGET per batch."""
+        batch = []
+        for key in self.redis_client.scan_iter(match="session:*", count=SESSION_SCAN_BATCH):
+            batch.append(key)
+            if len(batch) >= SESSION_SCAN_BATCH:
+                yield from self._load_session_batch(batch)
+                batch = []
+        if batch:
+            yield from self._load_session_batch(batch)
+    
+    def _load_session_batch(self, keys):
+        """Fetch a batch of session keys in a single round-trip."""
+        for key, data in zip(keys, self.redis_client.mget(keys)):
+            if data:
+                yield key, _loads(data)
+    
     def destroy_session(self, session_id: str):
         """Destroy a session."""
         if self.redis_client:
@@ -189,14 +265,14 @@ class RedisSessionManager:
         # Redis sessions
         if self.redis_client:
             try:
-                # Scan for user sessions
-                for key in self.redis_client.scan_iter(match="session:*"):
-                    data = self.redis_client.get(key)
-                    if data:
-                        session_data = json.loads(data)
-                        if session_data.get("user_id") == user_id:
-                            self.redis_client.delete(key)
-                            count += 1
+                # Scan for user sessions and delete them together
+                user_keys = [
+                    key for key, session_data in self._iter_redis_sessions()
+                    if session_data.get("user_id") == user_id
+                ]
+                if user_keys:
+                    self.redis_client.delete(*user_keys)
+                    count += len(user_keys)
             except Exception as e:
                 logger.error(f"Redis error destroying user sessions: {e}")
         
@@ -224,9 +300,9 @@ class RedisSessionManager:
                 logger.info(f"Token blacklisted in Redis: {token_hash[:8]}...")
             except Exception as e:
                 logger.error(f"Redis error blacklisting token: {e}")
-                self.blacklisted_tokens.add(token_hash)
+                self._blacklist_in_memory(token_hash)
         else:
-            self.blacklisted_tokens.add(token_hash)
+            self._blacklist_in_memory(token_hash)
             logger.info(f"Token blacklisted in memory: {token_hash[:8]}...")
     
     def is_token_blacklisted(self, token: str) -> bool:
@@ -242,14 +318,15 @@ class RedisSessionManager:
                 logger.error(f"Redis error checking blacklist: {e}")
         
         # Check memory
-        return token_hash in self.blacklisted_tokens
+        expires_at = self.blacklisted_tokens.get(token_hash)
+        return expires_at is not None and expires_at > time.monotonic()
     
     def get_active_session_count(self) -> int:
         """Get number of active sessions."""
         if self.redis_client:
             try:
                 count = 0
-                for _ in self.redis_client.scan_iter(match="session:*"):
+                for _ in self.redis_client.scan_iter(match="session:*", count=SESSION_SCAN_BATCH):
                     count += 1
                 return count
             except Exception as e:
@@ -263,12 +340,10 @@ class RedisSessionManager:
         
         if self.redis_client:
             try:
-                for key in self.redis_client.scan_iter(match="session:*"):
-                    data = self.redis_client.get(key)
-                    if data:
-                        session_data = json.loads(data)
-                        if session_data.get("user_id") == user_id:
-                            count += 1
+                count += sum(
+                    1 for _, session_data in self._iter_redis_sessions()
+                    if session_data.get("user_id") == user_id
+                )
             except Exception as e:
                 logger.error(f"Redis error counting user sessions: {e}")
         
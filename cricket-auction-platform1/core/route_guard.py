@@ -28,6 +28,7 @@ class RouteGuard:
     PUBLIC_ROUTES = [
         "/",
         "/health",
+        "/healthz",
         "/docs",
         "/openapi.json",
         "/redoc",
@@ -126,8 +127,8 @@ async def check_route_access(request: Request) -> Optional[RedirectResponse]:
     # Verify access
     if not RouteGuard.verify_access(path, user_role):
         logger.warning(
-            f"Access denied: {path} for user {user_email or 'anonymous'} "
-            f"with role {user_role or 'none'}"
+            "Access denied: %s for user %s with role %s",
+            path, user_email or "anonymous", user_role or "none"
         )
         
         # Redirect to home page with error
@@ -5,9 +5,13 @@ Includes CSRF protection, security headers, and request validation.
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from typing import Callable
+from urllib.parse import parse_qsl
 import secrets
 import hashlib
+import re
 import time
 from datetime import datetime, timezone
 import logging
@@ -55,12 +59,18 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+class RequestValidationMiddleware:
     """
     Validate and sanitize incoming requests.
     Prevents common injection attacks.
+    
+    Implemented as a pure ASGI middleware so oversized requests are
+    rejected from the raw header list before any body is received.
     """
     
+    # Maximum accepted Content-Length
+    MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB limit
+    
     # Suspicious patterns
     SUSPICIOUS_PATTERNS = [
         "<script", "javascript:", "onerror=", "onload=",
@@ -69,38 +79,61 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
         "<?php", "eval(", "exec(", "system("
     ]
     
-    async def dispatch(self, request: Request, call_next: Callable):
+    # Canned rejection, built once and replayed for every oversized request
+    TOO_LARGE_RESPONSE = JSONResponse(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        content={"detail": "Request too large"}
+    )
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Check request size
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > 10 * 1024 * 1024:  # 10MB limit
-            return JSONResponse(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                content={"detail": "Request too large"}
-            )
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.MAX_CONTENT_LENGTH:
+                    await self.TOO_LARGE_RESPONSE(scope, receive, send)
+                    return
+                break
         
-        # Check for suspicious patterns in URL
-        url_path = str(request.url.path).lower()
-        for pattern in self.SUSPICIOUS_PATTERNS:
-            if pattern.lower() in url_path:
-                logger.warning(f"Suspicious pattern detected in URL: {pattern} from {request.client.host}")
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={"detail": "Invalid request"}
-                )
-        
-        # Check query parameters
-        for key, value in request.query_params.items():
-            value_str = str(value).lower()
-            for pattern in self.SUSPICIOUS_PATTERNS:
-                if pattern.lower() in value_str:
-                    logger.warning(f"Suspicious pattern in query param: {pattern} from {request.client.host}")
-                    return JSONResponse(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        content={"detail": "Invalid request parameters"}
-                    )
+        # Check for suspicious patterns in URL and query parameters
+        match = _SUSPICIOUS_RE.search(scope["path"])
+        detail = "Invalid request"
+        if not match and scope["query_string"]:
+            # Values only, as before; parameter names are not scanned
+            query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+            for _, value in query:
+                match = _SUSPICIOUS_RE.search(value)
+                if match:
+                    break
+            detail = "Invalid request parameters"
         
-        response = await call_next(request)
-        return response
+        if match:
+            client = scope.get("client")
+            logger.warning(
+                "Suspicious pattern detected in request: %s from %s",
+                match.group(0), client[0] if client else "unknown"
+            )
+            response = JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"detail": detail}
+            )
+            await response(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, send)
+
+
+# Case-insensitive alternation of all suspicious patterns, compiled once
+_SUSPICIOUS_RE = re.compile(
+    "|".join(re.escape(p) for p in RequestValidationMiddleware.SUSPICIOUS_PATTERNS),
+    re.IGNORECASE
+)
 
 
 class CSRFProtectionMiddleware(BaseHTTPMiddleware):
@@ -166,7 +199,7 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
         session_id = request.cookies.get("session_id", "")
         
         if not csrf_token or not self.validate_csrf_token(csrf_token, session_id):
-            logger.warning(f"CSRF validation failed from {request.client.host}")
+            logger.warning("CSRF validation failed from %s", request.client.host)
             return JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": "CSRF validation failed"}
@@ -175,7 +208,7 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
-class AuditLogMiddleware(BaseHTTPMiddleware):
+class AuditLogMiddleware:
     """
     Log security-relevant events for audit trail.
     """
@@ -189,31 +222,63 @@ class AuditLogMiddleware(BaseHTTPMiddleware):
         "/players/"
     ]
     
-    async def dispatch(self, request: Request, call_next: Callable):
-        start_time = time.time()
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Check if this is a sensitive endpoint
-        is_sensitive = any(request.url.path.startswith(path) for path in self.SENSITIVE_ENDPOINTS)
+        # Reject most paths on their first character before any prefix matching
+        path = scope["path"]
+        if len(path) < 2:
+            await self.app(scope, receive, send)
+            return
+        first = ord(path[1])
+        if first > 0xFF or not _AUDIT_FIRST_CHAR_HITS[first] or not _SENSITIVE_RE.match(path):
+            await self.app(scope, receive, send)
+            return
         
-        if is_sensitive:
-            # Log request
-            logger.info(
-                f"AUDIT: {request.method} {request.url.path} "
-                f"from {request.client.host} "
-                f"user-agent: {request.headers.get('user-agent', 'unknown')}"
-            )
+        start_time = time.perf_counter()
+        method = scope["method"]
+        client = scope.get("client")
         
-        response = await call_next(request)
+        # Log request
+        logger.info(
+            "AUDIT: %s %s from %s user-agent: %s",
+            method, path, client[0] if client else "unknown",
+            Headers(scope=scope).get("user-agent", "unknown")
+        )
+        
+        status_code = 500
         
-        if is_sensitive:
-            duration = time.time() - start_time
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = round(time.perf_counter() - start_time, 3)
             # Log response
             logger.info(
-                f"AUDIT: {request.method} {request.url.path} "
-                f"status={response.status_code} duration={duration:.3f}s"
+                "AUDIT: %s %s status=%s duration=%ss",
+                method, path, status_code, duration
             )
-        
-        return response
+
+
+# First characters (after the leading "/") of every audited endpoint
+_AUDIT_FIRST_CHAR_HITS = bytearray(256)
+for _endpoint in AuditLogMiddleware.SENSITIVE_ENDPOINTS:
+    _AUDIT_FIRST_CHAR_HITS[ord(_endpoint[1])] = 1
+
+# Prefix match for audited endpoints, compiled once
+_SENSITIVE_RE = re.compile(
+    "|".join(re.escape(p) for p in AuditLogMiddleware.SENSITIVE_ENDPOINTS)
+)
 
 
 class IPWhitelistMiddleware(BaseHTTPMiddleware):
@@ -243,7 +308,7 @@ class IPWhitelistMiddleware(BaseHTTPMiddleware):
             client_ip = forwarded.split(",")[0].strip()
         
         if client_ip not in self.whitelist:
-            logger.warning(f"IP {client_ip} blocked from accessing admin endpoint")
+            logger.warning("IP %s blocked from accessing admin endpoint", client_ip)
             return JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": "Access denied"}
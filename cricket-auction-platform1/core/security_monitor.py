@@ -4,13 +4,66 @@ Tracks security events, detects attacks, and sends alerts.
 """
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
+import asyncio
 import logging
-from collections import defaultdict
+import re
+from collections import defaultdict, deque
+import time
 
 from database import db
 
 logger = logging.getLogger(__name__)
 
+# Sliding window for counting failed logins
+FAILED_LOGIN_WINDOW_SECONDS = 15 * 60
+# Attempts kept per IP; anything past the block threshold is only a count
+FAILED_LOGIN_HISTORY_LIMIT = 100
+# Write-behind buffer for security events; the oldest are dropped when full
+EVENT_QUEUE_LIMIT = 10_000
+EVENT_FLUSH_INTERVAL_SECONDS = 0.1
+EVENT_FLUSH_BATCH_SIZE = 256
+
+# Attack signatures, checked in order against lowercased input
+SQL_INJECTION_PATTERNS = (
+    "UNION SELECT", "DROP TABLE", "'; --", "OR 1=1",
+    "EXEC(", "xp_cmdshell", "INSERT INTO", "DELETE FROM",
+    "UPDATE SET", "CREATE TABLE", "ALTER TABLE"
+)
+XSS_PATTERNS = (
+    "<script", "javascript:", "onerror=", "onload=",
+    "onclick=", "onmouseover=", "<iframe", "eval(",
+    "document.cookie", "window.location"
+)
+PATH_TRAVERSAL_PATTERNS = (
+    "../", "..\\", "etc/passwd", "etc\\passwd",
+    "windows\\system32", "/etc/shadow", "cmd.exe"
+)
+
+# (original pattern, lowercased pattern) pairs so matching doesn't lower() per call
+_SQL_INJECTION_MATCHERS = tuple((p, p.lower()) for p in SQL_INJECTION_PATTERNS)
+_XSS_MATCHERS = tuple((p, p.lower()) for p in XSS_PATTERNS)
+_PATH_TRAVERSAL_MATCHERS = tuple((p, p.lower()) for p in PATH_TRAVERSAL_PATTERNS)
+
+
+def _compile_signatures(matchers) -> re.Pattern:
+    """Build one alternation so clean input is rejected in a single scan."""
+    return re.compile("|".join(re.escape(lower) for _, lower in matchers))
+
+
+def _first_match(matchers, regex, text_lower: str) -> Optional[str]:
+    """Return the first signature (in declaration order) found in text_lower."""
+    if not regex.search(text_lower):
+        return None
+    for pattern, pattern_lower in matchers:
+        if pattern_lower in text_lower:
+            return pattern
+    return None
+
+
+_SQL_INJECTION_RE = _compile_signatures(_SQL_INJECTION_MATCHERS)
+_XSS_RE = _compile_signatures(_XSS_MATCHERS)
+_PATH_TRAVERSAL_RE = _compile_signatures(_PATH_TRAVERSAL_MATCHERS)
+
 
 class SecurityMonitor:
     """
@@ -19,11 +72,51 @@ class SecurityMonitor:
     """
     
     def __init__(self):
-        self.failed_login_attempts = defaultdict(list)  # {ip: [timestamps]}
+        # {ip: deque([epoch seconds])}, bounded so a flood from one IP can't grow it
+        self.failed_login_attempts = defaultdict(
+            lambda: deque(maxlen=FAILED_LOGIN_HISTORY_LIMIT)
+        )
         self.suspicious_ips = set()
         self.blocked_ips = set()
         self.ip_violations = defaultdict(int)  # {ip: count}
-        
+        self.pending_events = deque(maxlen=EVENT_QUEUE_LIMIT)
+        self.flush_task: Optional[asyncio.Task] = None
+    
+    def start_event_flush(self):
+        """Start the background task that persists queued events."""
+        if not self.flush_task:
+            self.flush_task = asyncio.create_task(self.flush_events_periodically())
+    
+    async def stop_event_flush(self):
+        """Stop the background task and persist anything still queued."""
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+        await self.flush_events()
+    
+    async def flush_events_periodically(self):
+        """Batch queued events into the database every flush interval."""
+        while True:
+            await asyncio.sleep(EVENT_FLUSH_INTERVAL_SECONDS)
+            await self.flush_events()
+    
+    async def flush_events(self):
+        """Write queued events to the database in batches."""
+        while self.pending_events:
+            batch = []
+            while self.pending_events and len(batch) < EVENT_FLUSH_BATCH_SIZE:
+                batch.append(self.pending_events.popleft())
+            try:
+                await asyncio.to_thread(
+                    db.security_events.insert_many, batch, ordered=False
+                )
+            except Exception as e:
+                logger.error("Failed to flush %s security events: %s", len(batch), e)
+    
     def log_security_event(
         self,
         event_type: str,
@@ -34,6 +127,9 @@ class SecurityMonitor:
         """
         Log security event to database.
         
+        While the flush task is running the event is queued and written
+        in the next batch; otherwise it is inserted immediately.
+        
         Args:
             event_type: Type of event (brute_force, sql_injection, etc.)
             severity: low, medium, high, critical
@@ -48,11 +144,15 @@ class SecurityMonitor:
             "details": details
         }
         
-        try:
-            db.security_events.insert_one(event)
-            logger.info(f"Security event logged: {event_type} from {ip} (severity: {severity})")
-        except Exception as e:
-            logger.error(f"Failed to log security event: {e}")
+        if self.flush_task:
+            self.pending_events.append(event)
+            logger.info("Security event queued: %s from %s (severity: %s)", event_type, ip, severity)
+        else:
+            try:
+                db.security_events.insert_one(event)
+                logger.info("Security event logged: %s from %s (severity: %s)", event_type, ip, severity)
+            except Exception as e:
+                logger.error("Failed to log security event: %s", e)
         
         # Send alert if critical
         if severity == "critical":
@@ -60,17 +160,17 @@ class SecurityMonitor:
     
     def record_failed_login(self, ip: str, email: str):
         """Record failed login attempt."""
-        now = datetime.now(timezone.utc)
-        self.failed_login_attempts[ip].append(now)
+        now = time.time()
+        attempts_window = self.failed_login_attempts[ip]
+        attempts_window.append(now)
         
         # Clean old attempts (older than 15 minutes)
-        cutoff = now - timedelta(minutes=15)
-        self.failed_login_attempts[ip] = [
-            ts for ts in self.failed_login_attempts[ip] if ts > cutoff
-        ]
+        cutoff = now - FAILED_LOGIN_WINDOW_SECONDS
+        while attempts_window and attempts_window[0] <= cutoff:
+            attempts_window.popleft()
         
         # Check for brute force
-        attempts = len(self.failed_login_attempts[ip])
+        attempts = len(attempts_window)
         if attempts >= 5:
             self.detect_brute_force(ip, attempts, email)
             return True  # Should block
@@ -93,87 +193,69 @@ class SecurityMonitor:
         self.suspicious_ips.add(ip)
         self.ip_violations[ip] += 1
         
-        logger.warning(f"🚨 Brute force detected from {ip}: {failed_attempts} failed attempts")
+        logger.warning("🚨 Brute force detected from %s: %s failed attempts", ip, failed_attempts)
     
     def detect_sql_injection(self, ip: str, request_data: str, endpoint: str) -> bool:
         """Detect SQL injection attempts."""
-        sql_patterns = [
-            "UNION SELECT", "DROP TABLE", "'; --", "OR 1=1",
-            "EXEC(", "xp_cmdshell", "INSERT INTO", "DELETE FROM",
-            "UPDATE SET", "CREATE TABLE", "ALTER TABLE"
-        ]
-        
-        data_lower = request_data.lower()
-        for pattern in sql_patterns:
-            if pattern.lower() in data_lower:
-                self.log_security_event(
-                    event_type="sql_injection_attempt",
-                    severity="critical",
-                    ip=ip,
-                    details={
-                        "pattern": pattern,
-                        "endpoint": endpoint,
-                        "data_sample": request_data[:200]
-                    }
-                )
-                
-                self.ip_violations[ip] += 3  # Severe violation
-                logger.critical(f"🚨 SQL injection attempt from {ip}: pattern '{pattern}'")
-                return True
+        pattern = _first_match(
+            _SQL_INJECTION_MATCHERS, _SQL_INJECTION_RE, request_data.lower()
+        )
+        if pattern:
+            self.log_security_event(
+                event_type="sql_injection_attempt",
+                severity="critical",
+                ip=ip,
+                details={
+                    "pattern": pattern,
+                    "endpoint": endpoint,
+                    "data_sample": request_data[:200]
+                }
+            )
+            
+            self.ip_violations[ip] += 3  # Severe violation
+            logger.critical("🚨 SQL injection attempt from %s: pattern '%s'", ip, pattern)
+            return True
         
         return False
     
     def detect_xss_attempt(self, ip: str, request_data: str, endpoint: str) -> bool:
         """Detect XSS attempts."""
-        xss_patterns = [
-            "<script", "javascript:", "onerror=", "onload=",
-            "onclick=", "onmouseover=", "<iframe", "eval(",
-            "document.cookie", "window.location"
-        ]
-        
-        data_lower = request_data.lower()
-        for pattern in xss_patterns:
-            if pattern.lower() in data_lower:
-                self.log_security_event(
-                    event_type="xss_attempt",
-                    severity="high",
-                    ip=ip,
-                    details={
-                        "pattern": pattern,
-                        "endpoint": endpoint,
-                        "data_sample": request_data[:200]
-                    }
-                )
-                
-                self.ip_violations[ip] += 2
-                logger.warning(f"🚨 XSS attempt from {ip}: pattern '{pattern}'")
-                return True
+        pattern = _first_match(_XSS_MATCHERS, _XSS_RE, request_data.lower())
+        if pattern:
+            self.log_security_event(
+                event_type="xss_attempt",
+                severity="high",
+                ip=ip,
+                details={
+                    "pattern": pattern,
+                    "endpoint": endpoint,
+                    "data_sample": request_data[:200]
+                }
+            )
+            
+            self.ip_violations[ip] += 2
+            logger.warning("🚨 XSS attempt from %s: pattern '%s'", ip, pattern)
+            return True
         
         return False
     
     def detect_path_traversal(self, ip: str, path: str) -> bool:
         """Detect path traversal attempts."""
-        traversal_patterns = [
-            "../", "..\\", "etc/passwd", "etc\\passwd",
-            "windows\\system32", "/etc/shadow", "cmd.exe"
-        ]
-        
-        path_lower = path.lower()
-        for pattern in traversal_patterns:
-            if pattern.lower() in path_lower:
-                self.log_security_event(
-                    event_type="path_traversal_attempt",
-                    severity="critical",
-                    ip=ip,
-                    details={
-                        "pattern": pattern,
-                        "path": path
-                    }
-                )
-                
-                self.ip_violations[ip] += 3
-                logger.critical(f"🚨 Path traversal attempt from {ip}: {pattern}")
-                return True
+        pattern = _first_match(_PATH_TRAVERSAL_MATCHERS, _PATH_TRAVERSAL_RE, path.lower())
+        if pattern:
+            self.log_security_event(
+                event_type="path_traversal_attempt",
+                severity="critical",
+                ip=ip,
+                details={
+                    "pattern": pattern,
+                    "path": path
+                }
+            )
+            
+            self.ip_violations[ip] += 3
+            logger.critical("🚨 Path traversal attempt from %s: %s", ip, pattern)
+            return True
         
         return False
     
@@ -187,15 +269,18 @@ class SecurityMonitor:
     
     def get_failed_login_count(self, ip: str) -> int:
         """Get failed login count for IP."""
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(minutes=15)
+        attempts_window = self.failed_login_attempts.get(ip)
+        if not attempts_window:
+            return 0
         
         # Clean old attempts
-        self.failed_login_attempts[ip] = [
-            ts for ts in self.failed_login_attempts[ip] if ts > cutoff
-        ]
+        cutoff = time.time() - FAILED_LOGIN_WINDOW_SECONDS
+        while attempts_window and attempts_window[0] <= cutoff:
+            attempts_window.popleft()
         
-        return len(self.failed_login_attempts[ip])
+        if not attempts_window:
+            del self.failed_login_attempts[ip]
+        return len(attempts_window)
     
     def send_alert(self, event: dict):
         """
@@ -203,11 +288,12 @@ class SecurityMonitor:
         Can be extended to send emails, Slack messages, etc.
         """
         logger.critical(
-            f"🚨 SECURITY ALERT 🚨\n"
-            f"Type: {event['type']}\n"
-            f"Severity: {event['severity']}\n"
-            f"IP: {event['ip']}\n"
-            f"Details: {event['details']}"
+            "🚨 SECURITY ALERT 🚨\n"
+            "Type: %s\n"
+            "Severity: %s\n"
+            "IP: %s\n"
+            "Details: %s",
+            event['type'], event['severity'], event['ip'], event['details']
         )
         
         # TODO: Implement email/Slack notifications
@@ -220,28 +306,34 @@ class SecurityMonitor:
         last_24h = now - timedelta(hours=24)
         
         try:
-            # Get events from last 24 hours
-            recent_events = list(db.security_events.find({
-                "timestamp": {"$gte": last_24h}
-            }))
+            # Let MongoDB count events from the last 24 hours per
+            # (type, severity, ip) so only the distinct combinations come back
+            event_groups = db.security_events.aggregate([
+                {"$match": {"timestamp": {"$gte": last_24h}}},
+                {"$group": {
+                    "_id": {"type": "$type", "severity": "$severity", "ip": "$ip"},
+                    "count": {"$sum": 1}
+                }}
+            ])
             
             # Count by type
             events_by_type = defaultdict(int)
             events_by_severity = defaultdict(int)
+            ip_counts = defaultdict(int)
+            total_events = 0
             
-            for event in recent_events:
-                events_by_type[event["type"]] += 1
-                events_by_severity[event["severity"]] += 1
+            for group in event_groups:
+                key, count = group["_id"], group["count"]
+                events_by_type[key["type"]] += count
+                events_by_severity[key["severity"]] += count
+                ip_counts[key["ip"]] += count
+                total_events += count
             
             # Get top attacking IPs
-            ip_counts = defaultdict(int)
-            for event in recent_events:
-                ip_counts[event["ip"]] += 1
-            
             top_ips = sorted(ip_counts.items(), key=lambda x: x[1], reverse=True)[:10]
             
             return {
-                "total_events_24h": len(recent_events),
+                "total_events_24h": total_events,
                 "events_by_type": dict(events_by_type),
                 "events_by_severity": dict(events_by_severity),
                 "top_attacking_ips": [{"ip": ip, "count": count} for ip, count in top_ips],
@@ -250,24 +342,34 @@ class SecurityMonitor:
                 "active_violations": dict(self.ip_violations)
             }
         except Exception as e:
-            logger.error(f"Error getting security stats: {e}")
+            logger.error("Error getting security stats: %s", e)
             return {
                 "error": str(e),
                 "total_events_24h": 0
             }
     
+    def prune_failed_logins(self):
+        """
+        Drop failed-login windows whose newest attempt has expired.
+        In-memory only; call from the event loop, which also records logins.
+        """
+        login_cutoff = time.time() - FAILED_LOGIN_WINDOW_SECONDS
+        for ip in [ip for ip, attempts in self.failed_login_attempts.items()
+                   if not attempts or attempts[-1] <= login_cutoff]:
+            del self.failed_login_attempts[ip]
+    
     def cleanup_old_events(self, days: int = 90):
-        """Clean up old security events (data retention)."""
+        """Clean up old security events (data retention). Blocking DB call."""
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
         
         try:
             result = db.security_events.delete_many({
                 "timestamp": {"$lt": cutoff}
             })
-            logger.info(f"Cleaned up {result.deleted_count} old security events")
+            logger.info("Cleaned up %s old security events", result.deleted_count)
             return result.deleted_count
         except Exception as e:
-            logger.error(f"Error cleaning up security events: {e}")
+            logger.error("Error cleaning up security events: %s", e)
             return 0
 
 
@@ -6,6 +6,7 @@ from typing import Optional, Dict, Any
 from fastapi import WebSocket, WebSocketException, status
 from jose import jwt, JWTError
 from bson import ObjectId
+import asyncio
 import logging
 
 from core.config import settings
@@ -13,6 +14,30 @@ from database import db
 
 logger = logging.getLogger(__name__)
 
+# Only the fields copied into the connection's user dict
+_USER_PROJECTION = {"email": 1, "name": 1, "is_admin": 1, "team_id": 1, "role": 1}
+
+# In-flight user lookups, shared by WebSocket connects arriving together
+_pending_user_lookups: Dict[str, asyncio.Task] = {}
+
+
+async def _fetch_active_user(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch an active user without blocking the event loop.
+    Concurrent connects for the same user share one database lookup.
+    """
+    lookup = _pending_user_lookups.get(user_id)
+    if lookup is None:
+        lookup = asyncio.create_task(asyncio.to_thread(
+            db.users.find_one,
+            {"_id": ObjectId(user_id), "is_active": True},
+            _USER_PROJECTION
+        ))
+        _pending_user_lookups[user_id] = lookup
+        lookup.add_done_callback(lambda _: _pending_user_lookups.pop(user_id, None))
+    
+    return await asyncio.shield(lookup)
+
 
 async def authenticate_websocket(websocket: WebSocket) -> Optional[Dict[str, Any]]:
     """
@@ -35,7 +60,7 @@ async def authenticate_websocket(websocket: WebSocket) -> Optional[Dict[str, Any
             if message.get("type") == "auth":
                 token = message.get("token")
         except Exception as e:
-            logger.error(f"Error receiving auth message: {e}")
+            logger.error("Error receiving auth message: %s", e)
             return None
     
     if not token:
@@ -44,7 +69,9 @@ async def authenticate_websocket(websocket: WebSocket) -> Optional[Dict[str, Any
     
     # Validate token
     try:
-        payload = jwt.decode(
+        # Signature check and JSON parsing run in a worker thread
+        payload = await asyncio.to_thread(
+            jwt.decode,
             token,
             settings.JWT_SECRET,
             algorithms=[settings.JWT_ALGORITHM]
@@ -60,10 +87,10 @@ async def authenticate_websocket(websocket: WebSocket) -> Optional[Dict[str, Any
             return None
         
         # Fetch user from database
-        user = db.users.find_one({"_id": ObjectId(user_id), "is_active": True})
+        user = await _fetch_active_user(user_id)
         
         if not user:
-            logger.warning(f"User not found or inactive: {user_id}")
+            logger.warning("User not found or inactive: %s", user_id)
             return None
         
         return {
@@ -76,10 +103,10 @@ async def authenticate_websocket(websocket: WebSocket) -> Optional[Dict[str, Any
         }
         
     except JWTError as e:
-        logger.error(f"JWT validation error: {e}")
+        logger.error("JWT validation error: %s", e)
         return None
     except Exception as e:
-        logger.error(f"WebSocket authentication error: {e}")
+        logger.error("WebSocket authentication error: %s", e)
         return None
 
 
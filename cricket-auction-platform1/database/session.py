@@ -5,20 +5,31 @@ Handles MongoDB connection and provides database instance.
 from pymongo import MongoClient
 from core.config import settings
 import logging
-import os
 
 logger = logging.getLogger(__name__)
 
 # Get MongoDB URL from environment with fallback
-MONGODB_URL = os.getenv("MONGODB_URL", os.getenv("DATABASE_URL", "mongodb://localhost:27017"))
+MONGODB_URL = settings.mongodb_url
 
 try:
-    client = MongoClient(MONGODB_URL, serverSelectionTimeoutMS=5000)
+    # Pool sized for bursty bid traffic; keep warm connections and make
+    # callers fail fast instead of queueing when the pool is exhausted
+    client = MongoClient(
+        MONGODB_URL,
+        maxPoolSize=200,
+        minPoolSize=10,
+        maxIdleTimeMS=300_000,
+        waitQueueTimeoutMS=2000,
+        serverSelectionTimeoutMS=5000,
+        retryWrites=True,
+        compressors=settings.mongodb_compressors
+    )
     db = client[settings.DB_NAME]
     
-    # Test connection
-    client.server_info()
-    logger.info(f"Connected to MongoDB: {settings.DB_NAME}")
+    # The client connects lazily in the background; don't block worker
+    # startup on a round-trip here. The first real operation (or ping())
+    # fails within serverSelectionTimeoutMS if MongoDB is unreachable.
+    logger.info(f"MongoDB client configured for database: {settings.DB_NAME}")
     
 except Exception as e:
     logger.warning(f"MongoDB connection failed: {e}")
@@ -26,3 +37,8 @@ except Exception as e:
     # Create dummy client for now - will fail on actual operations
     client = None
     db = None
+
+
+def ping() -> dict:
+    """Round-trip to MongoDB for explicit health checks."""
+    return client.admin.command("ping")
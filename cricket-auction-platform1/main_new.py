@@ -7,11 +7,19 @@ Updated: 2026-02-16 - Added security enhancements and performance improvements
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
+import asyncio
+import hashlib
 import logging
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Tuple
+
+from pymongo import IndexModel, UpdateMany
+from pymongo.errors import OperationFailure
 
 from core.config import settings
 from core.security_middleware import (
@@ -25,8 +33,11 @@ from core.rate_limiter import rate_limiter
 from core.integrated_security import IntegratedSecurityMiddleware, SecurityEventLogger
 from core.security_monitor import security_monitor
 from core.auto_blocker import auto_blocker
+from core.monitoring import collection_counts
+from core.system_metrics import system_sampler
 from core.log_sanitizer import setup_sanitized_logging
 from core.performance_optimizer import (
+    FastJSONResponse,
     PerformanceMiddleware,
     ETaggerMiddleware,
     ResponseCompressionOptimizer,
@@ -43,6 +54,107 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bump when the startup migration or the index set below changes;
+# indexes are only (re)built when this moves
+SCHEMA_VERSION = 4
+
+
+async def ensure_indexes() -> bool:
+    """
+    Create the app's indexes, one createIndexes command per collection.
+    The collections are independent, so their commands run concurrently.
+    A failing collection is logged without stopping the others; returns
+    True only if every build succeeded.
+    """
+    index_specs = {
+        "users": [IndexModel("email", unique=True)],
+        "bid_history": [
+            IndexModel([("player_id", 1), ("timestamp", -1)]),
+            IndexModel([("team_id", 1)])
+        ],
+        "players": [
+            IndexModel("role"),
+            IndexModel("category"),
+            IndexModel("status"),
+            # Admin dashboard: per-round status counts (also serves plain
+            # auction_round queries) and the sorted role/status breakdown
+            IndexModel([("auction_round", 1), ("status", 1)]),
+            IndexModel([("status", 1), ("role", 1)])
+        ],
+        "teams": [
+            IndexModel(
+                "username",
+                unique=True,
+                partialFilterExpression={"username": {"$type": "string"}}
+            )
+        ],
+        "audit_logs": [
+            IndexModel([("event_type", 1), ("timestamp", -1)]),
+            IndexModel([("timestamp", -1)])
+        ]
+    }
+    results = await asyncio.gather(
+        *(asyncio.to_thread(db[name].create_indexes, models)
+          for name, models in index_specs.items()),
+        return_exceptions=True
+    )
+    
+    ok = True
+    for name, result in zip(index_specs, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error creating indexes on {name}: {result}")
+            ok = False
+    if ok:
+        logger.info("Database indexes created successfully")
+    return ok
+
+
+async def run_schema_migration():
+    """
+    Build indexes, backfill fields added after launch, then record the
+    schema version. The backfill runs even if an index build fails, but
+    the version is only recorded when everything succeeded, so a failed
+    step is retried on the next start.
+    """
+    logger.info("Running database migration...")
+    
+    indexes_ok = await ensure_indexes()
+    
+    # Update players with missing fields (one round-trip for all three)
+    result = db.players.bulk_write([
+        UpdateMany({"role": {"$exists": False}}, {"$set": {"role": None}}),
+        UpdateMany({"image_path": {"$exists": False}}, {"$set": {"image_path": None}}),
+        UpdateMany({"auction_round": {"$exists": False}}, {"$set": {"auction_round": 1}})
+    ], ordered=False)
+    if result.modified_count > 0:
+        logger.info(f"Added missing role/image_path/auction_round fields ({result.modified_count} updates)")
+    
+    # Update auction config
+    config = db.config.find_one({"key": "auction"})
+    if config and "auction_round" not in config:
+        db.config.update_one(
+            {"key": "auction"},
+            {"$set": {"auction_round": 1}}
+        )
+        logger.info("Added 'auction_round' to auction config")
+    
+    if not indexes_ok:
+        logger.warning("Index build incomplete; schema version not recorded, will retry on next start")
+        return
+    
+    # Superseded by the (auction_round, status) compound index
+    try:
+        db.players.drop_index("auction_round_1")
+    except OperationFailure:
+        pass  # already dropped
+    
+    db.config.update_one(
+        {"key": "schema_version"},
+        {"$set": {"value": SCHEMA_VERSION}},
+        upsert=True
+    )
+    logger.info("Database migration completed")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -60,10 +172,13 @@ async def lifespan(app: FastAPI):
         rate_limiter.start_cleanup()
         logger.info("Rate limiter started")
     
+    # Start system metrics sampling
+    system_sampler.start()
+    collection_counts.start()
+    
     # Start session cleanup
     from core.session_manager import session_manager
     from core.cloudinary_config import is_cloudinary_configured
-    import asyncio
     
     # Check Cloudinary configuration
     is_cloudinary_configured()
@@ -71,7 +186,12 @@ async def lifespan(app: FastAPI):
     async def cleanup_sessions():
         while True:
             await asyncio.sleep(300)  # Every 5 minutes
-            session_manager.cleanup_expired_sessions()
+            try:
+                # In-memory sweep; stays on the loop that mutates the shards
+                # and yields between them
+                await session_manager.cleanup_expired_sessions()
+            except Exception as e:
+                logger.error(f"Session cleanup failed: {e}")
     
     asyncio.create_task(cleanup_sessions())
     logger.info("Session manager started")
@@ -80,62 +200,35 @@ async def lifespan(app: FastAPI):
     async def cleanup_security():
         while True:
             await asyncio.sleep(3600)  # Every hour
-            security_monitor.cleanup_old_events(days=90)
-            auto_blocker.cleanup_expired_blocks()
+            try:
+                # In-memory pruning on the loop; only the DB deletes go to threads
+                security_monitor.prune_failed_logins()
+                await asyncio.to_thread(security_monitor.cleanup_old_events, days=90)
+                if await asyncio.to_thread(auto_blocker.cleanup_expired_blocks):
+                    await auto_blocker.load_blocked_ips()
+            except Exception as e:
+                logger.error(f"Security cleanup failed: {e}")
     
     asyncio.create_task(cleanup_security())
+    
+    # Keep the blocked-IP snapshot current (expiries, blocks from other workers)
+    async def refresh_blocklist():
+        while True:
+            await asyncio.sleep(settings.BLOCKLIST_REFRESH_INTERVAL)
+            await auto_blocker.load_blocked_ips()
+    
+    asyncio.create_task(refresh_blocklist())
+    security_monitor.start_event_flush()
     logger.info("✅ Security monitoring started")
     logger.info(f"✅ Auto-blocker initialized with {len(auto_blocker.blocked_ips)} blocked IPs")
     
-    # Create indexes
+    # Build indexes and migrate new fields, once per schema version
     try:
-        db.users.create_index("email", unique=True)
-        db.bid_history.create_index([("player_id", 1), ("timestamp", -1)])
-        db.bid_history.create_index([("team_id", 1)])
-        db.players.create_index("role")
-        db.players.create_index("category")
-        db.players.create_index("status")
-        db.players.create_index("auction_round")
-        logger.info("Database indexes created successfully")
-    except Exception as e:
-        logger.error(f"Error creating indexes: {e}")
-    
-    # Run simple database migration for new fields
-    try:
-        logger.info("Running database migration...")
-        
-        # Update players with missing fields
-        result = db.players.update_many(
-            {"role": {"$exists": False}},
-            {"$set": {"role": None}}
-        )
-        if result.modified_count > 0:
-            logger.info(f"Added 'role' field to {result.modified_count} players")
-        
-        result = db.players.update_many(
-            {"image_path": {"$exists": False}},
-            {"$set": {"image_path": None}}
-        )
-        if result.modified_count > 0:
-            logger.info(f"Added 'image_path' field to {result.modified_count} players")
-        
-        result = db.players.update_many(
-            {"auction_round": {"$exists": False}},
-            {"$set": {"auction_round": 1}}
-        )
-        if result.modified_count > 0:
-            logger.info(f"Added 'auction_round' field to {result.modified_count} players")
-        
-        # Update auction config
-        config = db.config.find_one({"key": "auction"})
-        if config and "auction_round" not in config:
-            db.config.update_one(
-                {"key": "auction"},
-                {"$set": {"auction_round": 1}}
-            )
-            logger.info("Added 'auction_round' to auction config")
-        
-        logger.info("Database migration completed")
+        marker = db.config.find_one({"key": "schema_version"}) or {}
+        if marker.get("value", 0) >= SCHEMA_VERSION:
+            logger.info(f"Database schema at version {marker['value']}, skipping migration")
+        else:
+            await run_schema_migration()
     except Exception as e:
         logger.warning(f"Migration warning: {e}")
     
@@ -145,6 +238,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application")
+    await security_monitor.stop_event_flush()
+    system_sampler.stop()
+    collection_counts.stop()
 
 
 # Initialize FastAPI app
@@ -152,23 +248,12 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Production-ready Cricket Auction Platform with real-time bidding and enhanced security",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 
 # Add Middleware (order matters!)
-# 0. HTTPS redirect middleware (FIRST - to handle Railway proxy)
-@app.middleware("http")
-async def https_redirect_middleware(request: Request, call_next):
-    """Ensure redirects use HTTPS when behind a proxy."""
-    # Check if we're behind a proxy (Railway sets X-Forwarded-Proto)
-    forwarded_proto = request.headers.get("x-forwarded-proto")
-    if forwarded_proto == "https":
-        # Override the request URL scheme to HTTPS
-        request.scope["scheme"] = "https"
-    response = await call_next(request)
-    return response
-
 # 1. Performance tracking (FIRST - to measure total time)
 app.add_middleware(PerformanceMiddleware)
 
@@ -224,17 +309,23 @@ if settings.ENABLE_RESPONSE_COMPRESSION:
     logger.info("Response compression enabled")
 
 
-# Add cache control middleware for static files
+# Proxy scheme + static cache headers (outermost; one middleware for both)
 @app.middleware("http")
-async def add_cache_control_headers(request: Request, call_next):
-    """Add cache control headers to prevent aggressive caching of JS/CSS files."""
+async def proxy_and_cache_headers(request: Request, call_next):
+    """
+    Ensure redirects use HTTPS when behind a proxy, and add cache control
+    headers to prevent aggressive caching of JS/CSS files.
+    """
+    # Check if we're behind a proxy (Railway sets X-Forwarded-Proto)
+    if request.headers.get("x-forwarded-proto") == "https":
+        # Override the request URL scheme to HTTPS
+        request.scope["scheme"] = "https"
+    
     response = await call_next(request)
     
     # For JavaScript and CSS files, use short cache with revalidation
-    if request.url.path.startswith("/static/") and (
-        request.url.path.endswith(".js") or 
-        request.url.path.endswith(".css")
-    ):
+    path = request.url.path
+    if path.startswith("/static/") and path.endswith((".js", ".css")):
         response.headers["Cache-Control"] = "public, max-age=300, must-revalidate"
         response.headers["Pragma"] = "no-cache"
     
@@ -244,6 +335,9 @@ async def add_cache_control_headers(request: Request, call_next):
 # Static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
+# Templates only change on deploy; skip the per-render stat() outside DEBUG
+templates.env.auto_reload = settings.DEBUG
+templates.env.bytecode_cache = FileSystemBytecodeCache()
 
 
 # Health check endpoint
@@ -272,36 +366,62 @@ async def debug_auth(request: Request):
     }
 
 
+@lru_cache(maxsize=1)
+def _service_worker_body() -> Tuple[bytes, str]:
+    """Read the service worker once and hash it for ETag revalidation."""
+    with open("static/service-worker.js", "rb") as f:
+        body = f.read()
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
 # Service Worker endpoint (must be at root for proper scope)
 @app.get("/service-worker.js")
-async def serve_service_worker():
+async def serve_service_worker(request: Request):
     """Serve the service worker with proper headers."""
-    from fastapi.responses import FileResponse
-    response = FileResponse("static/service-worker.js", media_type="application/javascript")
-    response.headers["Service-Worker-Allowed"] = "/"
-    response.headers["Cache-Control"] = "no-cache"
-    return response
+    body, etag = _service_worker_body()
+    headers = {
+        "Service-Worker-Allowed": "/",
+        "Cache-Control": "no-cache",
+        "ETag": etag
+    }
+    # Browsers revalidate on every page load; answer unchanged copies with 304
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/javascript", headers=headers)
+
+
+@lru_cache(maxsize=None)
+def _rendered_page(name: str) -> bytes:
+    """Render a page template once; the pages take no per-request context."""
+    return templates.get_template(name).render().encode("utf-8")
+
+
+def _page_response(name: str) -> HTMLResponse:
+    """Serve a pre-rendered page (re-rendered each time in DEBUG)."""
+    if settings.DEBUG:
+        return HTMLResponse(content=templates.get_template(name).render())
+    return HTMLResponse(content=_rendered_page(name))
 
 
 # Root endpoint - Player Registration Page
 @app.get("/", response_class=HTMLResponse)
 async def serve_index(request: Request):
     """Serve the main player registration page."""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return _page_response("index.html")
 
 
 # Hollywood Cinematic Live Auction Studio
 @app.get("/live", response_class=HTMLResponse)
 async def live_cinematic_studio(request: Request):
     """Serve the Level 3 Hollywood cinematic live auction studio."""
-    return templates.TemplateResponse("live_studio.html", {"request": request})
+    return _page_response("live_studio.html")
 
 
 # Admin page
 @app.get("/admin", response_class=HTMLResponse)
 async def admin_page(request: Request):
     """Serve the admin dashboard page."""
-    return templates.TemplateResponse("admin_fresh.html", {"request": request})
+    return _page_response("admin_fresh.html")
 
 
 # Debug admin page - DISABLED (file not found)
@@ -316,15 +436,14 @@ async def admin_page(request: Request):
 @app.get("/team/dashboard", response_class=HTMLResponse)
 async def team_dashboard_page(request: Request):
     """Serve the advanced team dashboard page."""
-    return templates.TemplateResponse("team_dashboard_new.html", {"request": request})
-    return templates.TemplateResponse("team_dashboard.html", {"request": request})
+    return _page_response("team_dashboard_new.html")
 
 
 # User dashboard page
 @app.get("/user/dashboard", response_class=HTMLResponse)
 async def user_dashboard_page(request: Request):
     """Serve the user dashboard page with action options."""
-    return templates.TemplateResponse("user_dashboard.html", {"request": request})
+    return _page_response("user_dashboard.html")
 
 
 # Include routers
@@ -6,71 +6,75 @@ from fastapi import APIRouter, HTTPException, Depends, Form
 from typing import Dict, Any
 from bson import ObjectId
 from datetime import datetime, timezone
+from pymongo import UpdateOne
+import asyncio
 
 from database import db
-from core.security import require_admin
+from core.security import require_admin, verify_password, hash_password
 from schemas.player import SetBasePriceRequest
+from services.bid_service import BidService
 from websocket.manager import manager
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
+def _aggregate_players(pipeline: list) -> list:
+    """Run an aggregation on players and materialize it (for asyncio.to_thread)."""
+    return list(db.players.aggregate(pipeline))
+
+
 @router.get("/dashboard/stats")
 async def get_dashboard_stats(current_user: dict = Depends(require_admin)):
     """Get dashboard statistics for admin - optimized with aggregation."""
     # Get current auction round
-    config = db.config.find_one({"key": "auction"}) or {}
+    config = await asyncio.to_thread(db.config.find_one, {"key": "auction"}) or {}
     current_round = config.get("auction_round", 1)
     
-    # Use aggregation pipeline for efficient stats calculation
-    pipeline = [
-        {
-            "$facet": {
-                "status_stats": [
-                    {"$group": {
-                        "_id": "$status",
-                        "count": {"$sum": 1}
-                    }}
-                ],
-                "round_stats": [
-                    {"$match": {"auction_round": current_round}},
-                    {"$group": {
-                        "_id": "$status",
-                        "count": {"$sum": 1}
-                    }}
-                ],
-                "role_stats": [
-                    {"$group": {
-                        "_id": {"role": "$role", "status": "$status"},
-                        "count": {"$sum": 1}
-                    }}
-                ],
-                "revenue": [
-                    {"$match": {"status": "sold"}},
-                    {"$group": {
-                        "_id": None,
-                        "total": {"$sum": "$final_bid"}
-                    }}
-                ],
-                "total_count": [
-                    {"$count": "count"}
-                ]
-            }
-        }
-    ]
-    
-    result = list(db.players.aggregate(pipeline))[0]
+    # Independent pipelines instead of one $facet, run concurrently on worker
+    # threads. Each leads with an indexable stage: the $sort lets the grouped
+    # counts walk the status / (status, role) indexes instead of scanning
+    (
+        status_stats,
+        round_stats,
+        role_stats_raw,
+        revenue,
+        total_players,
+        total_teams,
+        total_bids
+    ) = await asyncio.gather(
+        asyncio.to_thread(_aggregate_players, [
+            {"$sort": {"status": 1}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]),
+        asyncio.to_thread(_aggregate_players, [
+            {"$match": {"auction_round": current_round}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]),
+        asyncio.to_thread(_aggregate_players, [
+            {"$sort": {"status": 1, "role": 1}},
+            {"$group": {
+                "_id": {"role": "$role", "status": "$status"},
+                "count": {"$sum": 1}
+            }}
+        ]),
+        asyncio.to_thread(_aggregate_players, [
+            {"$match": {"status": "sold"}},
+            {"$group": {"_id": None, "total": {"$sum": "$final_bid"}}}
+        ]),
+        asyncio.to_thread(db.players.estimated_document_count),
+        asyncio.to_thread(db.teams.estimated_document_count),
+        asyncio.to_thread(db.bid_history.estimated_document_count)
+    )
     
     # Parse status stats
-    status_counts = {item["_id"]: item["count"] for item in result["status_stats"]}
-    total_players = result["total_count"][0]["count"] if result["total_count"] else 0
+    status_counts = {item["_id"]: item["count"] for item in status_stats}
     sold_players = status_counts.get("sold", 0)
     unsold_players = status_counts.get("unsold", 0)
     available_players = status_counts.get("available", 0)
     in_auction_players = status_counts.get("in_auction", 0)
     
     # Parse round stats
-    round_counts = {item["_id"]: item["count"] for item in result["round_stats"]}
+    round_counts = {item["_id"]: item["count"] for item in round_stats}
     current_round_sold = round_counts.get("sold", 0)
     current_round_unsold = round_counts.get("unsold", 0)
     current_round_available = round_counts.get("available", 0)
@@ -81,7 +85,7 @@ async def get_dashboard_stats(current_user: dict = Depends(require_admin)):
     for role in ["Batsman", "Bowler", "All-Rounder", "Wicketkeeper"]:
         role_stats[role] = {"total": 0, "sold": 0, "unsold": 0}
     
-    for item in result["role_stats"]:
+    for item in role_stats_raw:
         role = item["_id"]["role"]
         status = item["_id"]["status"]
         count = item["count"]
@@ -93,11 +97,7 @@ async def get_dashboard_stats(current_user: dict = Depends(require_admin)):
                 role_stats[role]["unsold"] = count
     
     # Get revenue
-    total_revenue = result["revenue"][0]["total"] if result["revenue"] else 0
-    
-    # Get other counts (these are fast)
-    total_teams = db.teams.count_documents({})
-    total_bids = db.bid_history.count_documents({})
+    total_revenue = revenue[0]["total"] if revenue else 0
     
     return {
         "total_players": total_players,
@@ -133,7 +133,7 @@ async def get_revenue_by_category(current_user: dict = Depends(require_admin)):
         }
     ]
     
-    results = list(db.players.aggregate(pipeline))
+    results = await asyncio.to_thread(_aggregate_players, pipeline)
     
     return {
         "categories": [
@@ -162,10 +162,12 @@ async def get_team_spending(current_user: dict = Depends(require_admin)):
         }
     ]
     
-    spending_by_team = {item["_id"]: item for item in db.players.aggregate(pipeline)}
-    
-    # Get all teams
-    teams = list(db.teams.find({}, {"_id": 1, "name": 1, "budget": 1}))
+    # Spending and the team list are independent; fetch them concurrently
+    spending, teams = await asyncio.gather(
+        asyncio.to_thread(_aggregate_players, pipeline),
+        asyncio.to_thread(lambda: list(db.teams.find({}, {"_id": 1, "name": 1, "budget": 1})))
+    )
+    spending_by_team = {item["_id"]: item for item in spending}
     
     team_data = []
     for team in teams:
@@ -271,16 +273,17 @@ async def get_activity_logs(
     # Get recent bids
     bids = list(db.bid_history.find().sort("timestamp", -1).limit(limit))
     
+    # Resolve all player and team names with one $in query each
+    player_names = BidService.lookup_names(db.players, (bid["player_id"] for bid in bids))
+    team_names = BidService.lookup_names(db.teams, (bid["team_id"] for bid in bids))
+    
     logs = []
     for bid in bids:
-        player = db.players.find_one({"_id": ObjectId(bid["player_id"])})
-        team = db.teams.find_one({"_id": ObjectId(bid["team_id"])})
-        
         logs.append({
             "type": "bid",
             "timestamp": bid["timestamp"],
-            "player_name": player.get("name") if player else "Unknown",
-            "team_name": team.get("name") if team else "Unknown",
+            "player_name": player_names.get(bid["player_id"]) or "Unknown",
+            "team_name": team_names.get(bid["team_id"]) or "Unknown",
             "amount": bid["bid_amount"],
             "is_winning": bid.get("is_winning", False)
         })
@@ -295,8 +298,6 @@ async def change_admin_password(
     current_user: dict = Depends(require_admin)
 ):
     """Change admin password."""
-    from core.security import verify_password, hash_password
-    
     # Get current user
     user = db.users.find_one({"_id": ObjectId(current_user["user_id"])})
     
@@ -304,7 +305,7 @@ async def change_admin_password(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Verify current password
-    if not verify_password(current_password, user["password_hash"]):
+    if not await asyncio.to_thread(verify_password, current_password, user["password_hash"]):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Validate new password
@@ -316,7 +317,7 @@ async def change_admin_password(
         {"_id": ObjectId(current_user["user_id"])},
         {
             "$set": {
-                "password_hash": hash_password(new_password),
+                "password_hash": await asyncio.to_thread(hash_password, new_password),
                 "updated_at": datetime.now(timezone.utc)
             }
         }
@@ -891,7 +892,7 @@ async def reset_auction(current_user: dict = Depends(require_admin)):
     """
     try:
         # Get original team budgets before reset
-        teams = list(db.teams.find({}))
+        teams = list(db.teams.find({}, {"original_budget": 1, "budget": 1}))
         original_budgets = {str(team["_id"]): team.get("original_budget", team.get("budget", 100000)) for team in teams}
         
         # Reset all players to available status
@@ -912,13 +913,13 @@ async def reset_auction(current_user: dict = Depends(require_admin)):
         # Clear all bid history
         bid_delete_result = db.bid_history.delete_many({})
         
-        # Reset all teams
-        team_reset_count = 0
+        # Reset all teams in a single batched write
+        team_updates = []
         for team in teams:
             team_id = team["_id"]
             original_budget = original_budgets.get(str(team_id), 100000)
             
-            db.teams.update_one(
+            team_updates.append(UpdateOne(
                 {"_id": team_id},
                 {
                     "$set": {
@@ -928,8 +929,10 @@ async def reset_auction(current_user: dict = Depends(require_admin)):
                         "players_count": 0
                     }
                 }
-            )
-            team_reset_count += 1
+            ))
+        if team_updates:
+            db.teams.bulk_write(team_updates, ordered=False)
+        team_reset_count = len(team_updates)
         
         # Clear auction config
         db.config.update_one(
@@ -985,8 +988,8 @@ async def get_reset_preview(current_user: dict = Depends(require_admin)):
         sold_count = db.players.count_documents({"status": "sold"})
         unsold_count = db.players.count_documents({"status": "unsold"})
         in_auction_count = db.players.count_documents({"status": "in_auction"})
-        total_bids = db.bid_history.count_documents({})
-        teams_count = db.teams.count_documents({})
+        total_bids = db.bid_history.estimated_document_count()
+        teams_count = db.teams.estimated_document_count()
         
         return {
             "ok": True,
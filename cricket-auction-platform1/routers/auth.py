@@ -5,10 +5,13 @@ Handles user registration, login, and token refresh.
 from fastapi import APIRouter, HTTPException, Form, Depends, status, Request, Response
 from datetime import datetime, timezone
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+import asyncio
 
 from core.security import (
     hash_password,
     verify_password,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -16,6 +19,8 @@ from core.security import (
 )
 from core.password_validator import validate_password
 from core.config import settings
+from core.rate_limiter import rate_limiter, get_client_ip
+from core.session_manager import session_manager
 from database import db
 from schemas.user import TokenResponse, UserResponse
 
@@ -55,8 +60,9 @@ async def register(
     # Validate password strength
     validate_password(password)
     
-    # Check if email already exists
-    if db.users.find_one({"email": email}):
+    # Check if email already exists (cheap indexed lookup that skips hashing
+    # for obvious duplicates; the unique index still guards the insert)
+    if db.users.find_one({"email": email}, {"_id": 1}):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -65,20 +71,30 @@ async def register(
     # Create user
     is_admin = email in settings.admin_email_list
     
+    # bcrypt releases the GIL, so hashing in a worker thread keeps the
+    # event loop free and lets concurrent requests hash on separate cores
+    password_hash = await asyncio.to_thread(hash_password, password)
+    
+    now = datetime.now(timezone.utc)
     user_doc = {
         "email": email,
-        "password_hash": hash_password(password),
+        "password_hash": password_hash,
         "name": name or "",
         "is_active": True,
         "is_admin": is_admin,
         "role": "admin" if is_admin else "viewer",
         "team_id": None,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     }
     
-    db.users.create_index("email", unique=True)
-    db.users.insert_one(user_doc)
+    try:
+        db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     return {"ok": True, "message": "Registration successful. Please log in."}
 
@@ -93,8 +109,6 @@ async def logout(
     Logout - invalidate token and destroy session.
     Forces user to re-login, no auto-login.
     """
-    from core.session_manager import session_manager
-    
     # Get token from header or cookie
     token = None
     auth_header = request.headers.get("authorization", "")
@@ -133,11 +147,6 @@ async def login(
     Login with strict security - no auto-login, no persistent sessions.
     Accepts both Form data and JSON.
     """
-    # Import dependencies
-    from core.rate_limiter import rate_limiter, get_client_ip
-    from core.config import settings
-    from core.session_manager import session_manager
-    
     # If Form data not provided, try to get from JSON body
     if not email or not password:
         try:
@@ -163,7 +172,7 @@ async def login(
     
     user = db.users.find_one({"email": email})
     
-    if not user or not verify_password(password, user["password_hash"]):
+    if not user or not await asyncio.to_thread(verify_password, password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -175,6 +184,13 @@ async def login(
             detail="Account is disabled"
         )
     
+    # Migrate hashes made with an older work factor now that we have the password
+    if password_needs_rehash(user["password_hash"]):
+        db.users.update_one(
+            {"_id": user["_id"]},
+            {"$set": {"password_hash": await asyncio.to_thread(hash_password, password)}}
+        )
+    
     user_id = str(user["_id"])
     
     # Destroy any existing sessions for this user (force re-login)
@@ -294,12 +310,19 @@ async def team_login(
     
     team = db.teams.find_one({"username": username})
     
-    if not team or not verify_password(password, team.get("hashed_password", "")):
+    if not team or not await asyncio.to_thread(verify_password, password, team.get("hashed_password", "")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
     
+    # Migrate hashes made with an older work factor now that we have the password
+    if password_needs_rehash(team["hashed_password"]):
+        db.teams.update_one(
+            {"_id": team["_id"]},
+            {"$set": {"hashed_password": await asyncio.to_thread(hash_password, password)}}
+        )
+    
     team_id = str(team["_id"])
     
     # Create tokens with team role
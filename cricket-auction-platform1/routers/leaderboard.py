@@ -4,10 +4,11 @@ Provides various leaderboards for teams and players.
 """
 from fastapi import APIRouter, Depends
 from typing import List, Dict, Any
-from bson import ObjectId
+import heapq
 
 from database import db
 from core.security import get_current_user
+from services.bid_service import BidService
 
 router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
 
@@ -37,13 +38,14 @@ async def get_top_spenders(
         ]
         
         spending_data = list(db.players.aggregate(pipeline))
+        teams = BidService.lookup_docs(db.teams, (entry["_id"] for entry in spending_data), {"name": 1, "budget": 1})
         
         # Enrich with team details
         leaderboard = []
         rank = 1
         
         for entry in spending_data:
-            team = db.teams.find_one({"_id": ObjectId(entry["_id"])})
+            team = teams.get(str(entry["_id"]))
             if team:
                 leaderboard.append({
                     "rank": rank,
@@ -89,12 +91,13 @@ async def get_top_teams(
         ]
         
         team_data = list(db.players.aggregate(pipeline))
+        teams = BidService.lookup_docs(db.teams, (entry["_id"] for entry in team_data), {"name": 1, "budget": 1})
         
         # Calculate value for money index
         teams_with_index = []
         
         for entry in team_data:
-            team = db.teams.find_one({"_id": ObjectId(entry["_id"])})
+            team = teams.get(str(entry["_id"]))
             if team:
                 # Value for money: more players for less money = better
                 # Index = (players_bought * 10000) / avg_price
@@ -110,12 +113,12 @@ async def get_top_teams(
                     "remaining_budget": team.get("budget", 0)
                 })
         
-        # Sort by value index
-        teams_with_index.sort(key=lambda x: x["value_for_money_index"], reverse=True)
+        # Keep only the top entries by value index
+        top_teams = heapq.nlargest(limit, teams_with_index, key=lambda x: x["value_for_money_index"])
         
         # Add ranks
         leaderboard = []
-        for rank, team in enumerate(teams_with_index[:limit], 1):
+        for rank, team in enumerate(top_teams, 1):
             team["rank"] = rank
             leaderboard.append(team)
         
@@ -155,15 +158,14 @@ async def get_top_players(
         ).sort("final_bid", -1).limit(limit))
         
         # Enrich with team names
+        team_names = BidService.lookup_names(
+            db.teams, (player["final_team"] for player in players if player.get("final_team"))
+        )
         leaderboard = []
         rank = 1
         
         for player in players:
-            team_name = None
-            if player.get("final_team"):
-                team = db.teams.find_one({"_id": ObjectId(player["final_team"])})
-                if team:
-                    team_name = team.get("name")
+            team_name = team_names.get(player.get("final_team"))
             
             leaderboard.append({
                 "rank": rank,
@@ -213,13 +215,14 @@ async def get_most_active_bidders(
         ]
         
         bid_data = list(db.bid_history.aggregate(pipeline))
+        teams = BidService.lookup_docs(db.teams, (entry["_id"] for entry in bid_data), {"name": 1, "budget": 1})
         
         # Enrich with team details
         leaderboard = []
         rank = 1
         
         for entry in bid_data:
-            team = db.teams.find_one({"_id": ObjectId(entry["_id"])})
+            team = teams.get(str(entry["_id"]))
             if team:
                 success_rate = (entry["winning_bids"] / entry["total_bids"] * 100) if entry["total_bids"] > 0 else 0
                 
@@ -254,7 +257,31 @@ async def get_combined_leaderboard(current_user: dict = Depends(get_current_user
     """
     try:
         # Get all teams
-        teams = list(db.teams.find())
+        teams = list(db.teams.find({}, {"name": 1, "budget": 1}))
+        
+        # Spending and bidding totals for every team, one grouped pass each
+        spending = {
+            entry["_id"]: entry for entry in db.players.aggregate([
+                {"$match": {"status": "sold"}},
+                {"$group": {
+                    "_id": "$final_team",
+                    "total_spent": {"$sum": {"$ifNull": ["$final_bid", 0]}},
+                    "players_bought": {"$sum": 1},
+                    "highest_purchase": {"$max": {"$ifNull": ["$final_bid", 0]}}
+                }}
+            ])
+        }
+        bidding = {
+            entry["_id"]: entry for entry in db.bid_history.aggregate([
+                {"$group": {
+                    "_id": "$team_id",
+                    "total_bids": {"$sum": 1},
+                    "winning_bids": {
+                        "$sum": {"$cond": [{"$eq": ["$is_winning", True]}, 1, 0]}
+                    }
+                }}
+            ])
+        }
         
         combined = []
         
@@ -262,14 +289,15 @@ async def get_combined_leaderboard(current_user: dict = Depends(get_current_user
             team_id = str(team["_id"])
             
             # Get spending data
-            players = list(db.players.find({"final_team": team_id, "status": "sold"}))
-            total_spent = sum(p.get("final_bid", 0) for p in players)
-            players_count = len(players)
-            highest_purchase = max([p.get("final_bid", 0) for p in players], default=0)
+            team_spending = spending.get(team_id, {})
+            total_spent = team_spending.get("total_spent", 0)
+            players_count = team_spending.get("players_bought", 0)
+            highest_purchase = team_spending.get("highest_purchase", 0)
             
             # Get bidding data
-            bid_count = db.bid_history.count_documents({"team_id": team_id})
-            winning_bids = db.bid_history.count_documents({"team_id": team_id, "is_winning": True})
+            team_bidding = bidding.get(team_id, {})
+            bid_count = team_bidding.get("total_bids", 0)
+            winning_bids = team_bidding.get("winning_bids", 0)
             
             # Calculate scores
             avg_price = total_spent / players_count if players_count > 0 else 0
@@ -95,10 +95,20 @@ async def get_my_wishlist(current_user: dict = Depends(get_current_user)):
             "user_id": current_user.get("user_id")
         }).sort("priority", 1))
         
-        # Get full player details
+        # Get full player details in one query instead of one per item
+        player_ids = [ObjectId(item["player_id"]) for item in wishlist_items]
+        players_by_id = {
+            str(p["_id"]): p
+            for p in db.players.find(
+                {"_id": {"$in": player_ids}},
+                {"name": 1, "role": 1, "category": 1, "base_price": 1,
+                 "status": 1, "image_path": 1, "is_live": 1}
+            )
+        } if player_ids else {}
+        
         for item in wishlist_items:
             item["_id"] = str(item["_id"])
-            player = db.players.find_one({"_id": ObjectId(item["player_id"])})
+            player = players_by_id.get(item["player_id"])
             if player:
                 item["player_details"] = {
                     "name": player.get("name"),
@@ -3,10 +3,11 @@ Bid management service.
 Handles bid placement, validation, and history tracking.
 Enhanced with notification and audit logging (2026-03-13).
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List
 from datetime import datetime, timezone
 from bson import ObjectId
 from fastapi import HTTPException
+from pymongo import ReturnDocument
 
 from database import db
 from core.config import settings
@@ -135,10 +136,12 @@ class BidService:
                     {"$inc": {"budget": previous_bid}}
                 )
         
-        # Deduct from new team's budget
-        db.teams.update_one(
+        # Deduct from new team's budget, reading the result back in the same call
+        updated_team = db.teams.find_one_and_update(
             {"_id": tid},
-            {"$inc": {"budget": -bid_amount}}
+            {"$inc": {"budget": -bid_amount}},
+            projection={"name": 1, "budget": 1},
+            return_document=ReturnDocument.AFTER
         )
         
         # Reset auction timer
@@ -156,7 +159,6 @@ class BidService:
         await manager.broadcast_bid(bid_data)
         
         # Broadcast team budget update
-        updated_team = db.teams.find_one({"_id": tid})
         team_data = {
             "team_id": team_id,
             "team_name": updated_team.get("name"),
@@ -176,7 +178,7 @@ class BidService:
         
         # Audit log
         # Get bidder email
-        bidder = db.users.find_one({"_id": ObjectId(bidder_id)})
+        bidder = db.users.find_one({"_id": ObjectId(bidder_id)}, {"email": 1})
         bidder_email = bidder.get("email") if bidder else "unknown"
         
         audit_logger.log_bid(
@@ -213,11 +215,11 @@ class BidService:
         ).sort("timestamp", -1))
         
         # Enrich with team names
+        team_names = BidService.lookup_names(db.teams, (bid["team_id"] for bid in bids))
         for bid in bids:
             bid["_id"] = str(bid["_id"])
-            team = db.teams.find_one({"_id": ObjectId(bid["team_id"])})
-            if team:
-                bid["team_name"] = team.get("name")
+            if bid["team_id"] in team_names:
+                bid["team_name"] = team_names[bid["team_id"]]
         
         return {
             "player_id": player_id,
@@ -231,18 +233,48 @@ class BidService:
     def get_all_bid_history() -> List[Dict[str, Any]]:
         """Get complete bid history for all players."""
         bids = list(db.bid_history.find().sort("timestamp", -1).limit(1000))
+        player_names = BidService.lookup_names(db.players, (bid["player_id"] for bid in bids))
+        team_names = BidService.lookup_names(db.teams, (bid["team_id"] for bid in bids))
         
         for bid in bids:
             bid["_id"] = str(bid["_id"])
             
             # Enrich with player name
-            player = db.players.find_one({"_id": ObjectId(bid["player_id"])})
-            if player:
-                bid["player_name"] = player.get("name")
+            if bid["player_id"] in player_names:
+                bid["player_name"] = player_names[bid["player_id"]]
             
             # Enrich with team name
-            team = db.teams.find_one({"_id": ObjectId(bid["team_id"])})
-            if team:
-                bid["team_name"] = team.get("name")
+            if bid["team_id"] in team_names:
+                bid["team_name"] = team_names[bid["team_id"]]
         
         return bids
+    
+    @staticmethod
+    def lookup_docs(collection, ids: Iterable[str], projection: Dict[str, int]) -> Dict[str, Dict]:
+        """
+        Fetch documents for many string IDs with a single $in query, keyed by string ID.
+        Invalid or unknown IDs are left out of the result.
+        """
+        object_ids = set()
+        for doc_id in ids:
+            if not doc_id:
+                continue
+            try:
+                object_ids.add(ObjectId(doc_id))
+            except Exception:
+                continue
+        
+        if not object_ids:
+            return {}
+        
+        docs = collection.find({"_id": {"$in": list(object_ids)}}, projection)
+        return {str(doc["_id"]): doc for doc in docs}
+    
+    @staticmethod
+    def lookup_names(collection, ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Resolve document names for many string IDs with a single $in query.
+        Invalid or unknown IDs are left out of the result.
+        """
+        docs = BidService.lookup_docs(collection, ids, {"name": 1})
+        return {doc_id: doc.get("name") for doc_id, doc in docs.items()}
@@ -13,6 +13,20 @@ import gzip
 
 logger = logging.getLogger(__name__)
 
+# Use orjson for faster serialization when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _encode(message: dict) -> str:
+    """Serialize a message to compact JSON text, like WebSocket.send_json does."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
 
 class ConnectionManager:
     """
@@ -27,6 +41,8 @@ class ConnectionManager:
     def __init__(self):
         # Active connections: {connection_id: {"ws": WebSocket, "user": dict, "last_ping": datetime}}
         self.active_connections: Dict[str, Dict[str, Any]] = {}
+        # Running count of authenticated entries in active_connections
+        self.authenticated_count: int = 0
         # User to connection mapping
         self.user_connections: Dict[str, Set[str]] = {}
         # Room-based connections (e.g., team rooms)
@@ -57,6 +73,9 @@ class ConnectionManager:
             "authenticated": user_data is not None
         }
         
+        if user_data is not None:
+            self.authenticated_count += 1
+        
         if user_data:
             user_id = user_data.get("user_id")
             if user_id:
@@ -69,7 +88,7 @@ class ConnectionManager:
                 if team_id:
                     await self.join_room(connection_id, f"team_{team_id}")
         
-        logger.info(f"WebSocket connected: {connection_id} (user: {user_data.get('email') if user_data else 'anonymous'})")
+        logger.info("WebSocket connected: %s (user: %s)", connection_id, user_data.get('email') if user_data else 'anonymous')
         
         # Start heartbeat if not running
         if not self.heartbeat_task:
@@ -88,6 +107,9 @@ class ConnectionManager:
             conn_data = self.active_connections[connection_id]
             user_data = conn_data.get("user")
             
+            if conn_data.get("authenticated"):
+                self.authenticated_count -= 1
+            
             if user_data:
                 user_id = user_data.get("user_id")
                 if user_id and user_id in self.user_connections:
@@ -104,14 +126,14 @@ class ConnectionManager:
             
             del self.active_connections[connection_id]
         
-        logger.info(f"WebSocket disconnected: {connection_id}")
+        logger.info("WebSocket disconnected: %s", connection_id)
     
     async def join_room(self, connection_id: str, room_name: str):
         """Add connection to a room for selective broadcasting."""
         if room_name not in self.rooms:
             self.rooms[room_name] = set()
         self.rooms[room_name].add(connection_id)
-        logger.debug(f"Connection {connection_id} joined room {room_name}")
+        logger.debug("Connection %s joined room %s", connection_id, room_name)
     
     async def leave_room(self, connection_id: str, room_name: str):
         """Remove connection from a room."""
@@ -135,7 +157,7 @@ class ConnectionManager:
                         await conn_data["ws"].send_json({"type": "ping"})
                         conn_data["last_ping"] = now
                     except Exception as e:
-                        logger.warning(f"Heartbeat failed for {connection_id}: {e}")
+                        logger.warning("Heartbeat failed for %s: %s", connection_id, e)
                         disconnected.append(connection_id)
                 
                 # Clean up dead connections
@@ -145,52 +167,59 @@ class ConnectionManager:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Heartbeat loop error: {e}")
+                logger.error("Heartbeat loop error: %s", e)
     
     async def send_personal_message(self, message: dict, connection_id: str, compress: bool = False):
         """Send a message to a specific connection with optional compression."""
         if connection_id in self.active_connections:
-            try:
-                conn_data = self.active_connections[connection_id]
+            await self._send_encoded(_encode(message), connection_id, compress)
+    
+    async def _send_encoded(self, message_json: str, connection_id: str, compress: bool = False):
+        """Send an already-serialized message to a specific connection."""
+        try:
+            conn_data = self.active_connections[connection_id]
+            
+            if compress and len(message_json) > 1024:
+                # Compress large messages
+                await conn_data["ws"].send_bytes(gzip.compress(message_json.encode()))
+            else:
+                await conn_data["ws"].send_text(message_json)
                 
-                if compress and len(json.dumps(message)) > 1024:
-                    # Compress large messages
-                    compressed = gzip.compress(json.dumps(message).encode())
-                    await conn_data["ws"].send_bytes(compressed)
-                else:
-                    await conn_data["ws"].send_json(message)
-                    
-            except Exception as e:
-                logger.error(f"Error sending to {connection_id}: {e}")
-                self.disconnect(connection_id)
+        except Exception as e:
+            logger.error("Error sending to %s: %s", connection_id, e)
+            self.disconnect(connection_id)
     
     async def broadcast(self, message: dict, exclude: Optional[Set[str]] = None, compress: bool = False):
         """Broadcast a message to all connected clients with optional compression."""
         exclude = exclude or set()
         disconnected = []
         
-        # Prepare message once
-        if compress:
-            message_json = json.dumps(message)
-            if len(message_json) > 1024:
-                compressed_data = gzip.compress(message_json.encode())
-                use_compression = True
-            else:
-                use_compression = False
+        # Prepare message once instead of serializing it per connection
+        message_json = _encode(message)
+        if compress and len(message_json) > 1024:
+            compressed_data = gzip.compress(message_json.encode())
+            use_compression = True
         else:
             use_compression = False
         
+        # Send to all clients concurrently so one slow socket doesn't
+        # hold up everyone queued behind it
+        connection_ids = []
+        sends = []
         for connection_id, conn_data in self.active_connections.items():
             if connection_id in exclude:
                 continue
             
-            try:
-                if use_compression:
-                    await conn_data["ws"].send_bytes(compressed_data)
-                else:
-                    await conn_data["ws"].send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to {connection_id}: {e}")
+            connection_ids.append(connection_id)
+            if use_compression:
+                sends.append(conn_data["ws"].send_bytes(compressed_data))
+            else:
+                sends.append(conn_data["ws"].send_text(message_json))
+        
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for connection_id, result in zip(connection_ids, results):
+            if isinstance(result, Exception):
+                logger.error("Error broadcasting to %s: %s", connection_id, result)
                 disconnected.append(connection_id)
         
         # Clean up disconnected clients
@@ -203,13 +232,14 @@ class ConnectionManager:
             return
         
         disconnected = []
+        message_json = _encode(message)
         
-        for connection_id in self.rooms[room_name]:
+        for connection_id in list(self.rooms[room_name]):
             if connection_id in self.active_connections:
                 try:
-                    await self.send_personal_message(message, connection_id, compress)
+                    await self._send_encoded(message_json, connection_id, compress)
                 except Exception as e:
-                    logger.error(f"Error broadcasting to room {room_name}, connection {connection_id}: {e}")
+                    logger.error("Error broadcasting to room %s, connection %s: %s", room_name, connection_id, e)
                     disconnected.append(connection_id)
         
         # Clean up
@@ -218,10 +248,12 @@ class ConnectionManager:
     
     async def broadcast_to_users(self, message: dict, user_ids: Set[str]):
         """Broadcast a message to specific users."""
+        message_json = _encode(message)
         for user_id in user_ids:
             if user_id in self.user_connections:
-                for connection_id in self.user_connections[user_id]:
-                    await self.send_personal_message(message, connection_id)
+                for connection_id in list(self.user_connections[user_id]):
+                    if connection_id in self.active_connections:
+                        await self._send_encoded(message_json, connection_id)
     
     async def broadcast_bid(self, bid_data: dict):
         """Broadcast a new bid to all clients (high priority)."""
@@ -326,7 +358,7 @@ class ConnectionManager:
     
     def get_authenticated_count(self) -> int:
         """Get the number of authenticated connections."""
-        return sum(1 for conn in self.active_connections.values() if conn.get("authenticated"))
+        return self.authenticated_count
     
     def get_room_count(self, room_name: str) -> int:
         """Get the number of connections in a room."""
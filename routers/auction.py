@@ -4,10 +4,11 @@ Handles auction control, bidding, and real-time updates.
 """
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Query
 from typing import Dict, Optional
-from bson import ObjectId
-import uuid
+import secrets
 
 from core.security import get_current_user, require_admin
+from core.rate_limiter import rate_limiter
+from core.config import settings
 from services.auction_service import AuctionService
 from services.bid_service import BidService
 from schemas.auction import AuctionStatus, SetCurrentPlayerRequest
@@ -213,10 +214,6 @@ async def place_bid(
     current_user: Dict = Depends(get_current_user)
 ):
     """Place a bid on the current player with rate limiting."""
-    # Import rate limiter
-    from core.rate_limiter import rate_limiter
-    from core.config import settings
-    
     # Apply rate limiting if enabled
     if settings.ENABLE_RATE_LIMITING:
         await rate_limiter.check_bid_rate_limit(current_user["user_id"])
@@ -254,22 +251,15 @@ async def get_all_bid_history(current_user: Dict = Depends(require_admin)):
     """Get complete bid history (Admin only). Updated 2026-02-14."""
     try:
         bids = list(db.bid_history.find().sort("timestamp", -1).limit(200))
+        player_names = BidService.lookup_names(db.players, (bid.get("player_id") for bid in bids))
+        team_names = BidService.lookup_names(db.teams, (bid.get("team_id") for bid in bids))
         
         for bid in bids:
             bid["_id"] = str(bid["_id"])
             
-            # Get player and team names with error handling
-            try:
-                player = db.players.find_one({"_id": ObjectId(bid["player_id"])})
-                bid["player_name"] = player.get("name") if player else "Unknown"
-            except Exception:
-                bid["player_name"] = "Unknown"
-            
-            try:
-                team = db.teams.find_one({"_id": ObjectId(bid["team_id"])})
-                bid["team_name"] = team.get("name") if team else "Unknown"
-            except Exception:
-                bid["team_name"] = "Unknown"
+            # Get player and team names, falling back for missing/invalid IDs
+            bid["player_name"] = player_names.get(bid.get("player_id")) or "Unknown"
+            bid["team_name"] = team_names.get(bid.get("team_id")) or "Unknown"
         
         return {"ok": True, "bids": bids}
     except Exception as e:
@@ -283,7 +273,8 @@ async def websocket_endpoint(websocket: WebSocket):
     WebSocket endpoint for real-time auction updates.
     Clients receive live bid updates, timer, and player changes.
     """
-    connection_id = str(uuid.uuid4())
+    # Only needs to be unique among this process's live connections
+    connection_id = secrets.token_hex(8)
     
     await manager.connect(websocket, connection_id)
     
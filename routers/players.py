@@ -169,6 +169,7 @@ async def public_player_register(
             print(f"⚠️ Cloudinary not configured - image will not be saved")
             print(f"   Set CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET in Railway")
     
+    now = datetime.now(timezone.utc)
     player_doc = {
         "name": name,
         "role": role,
@@ -188,8 +189,8 @@ async def public_player_register(
         "final_team": None,
         "final_bid": None,
         "created_by": None,
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     }
     
     result = db.players.insert_one(player_doc)
@@ -208,6 +209,7 @@ async def add_player(
 ):
     """Add a new player (Admin only)."""
     player_doc = player.dict()
+    now = datetime.now(timezone.utc)
     player_doc.update({
         "status": "available",
         "base_price_status": "set" if player.base_price else "pending",
@@ -216,8 +218,8 @@ async def add_player(
         "final_team": None,
         "final_bid": None,
         "created_by": current_user["user_id"],
-        "created_at": datetime.now(timezone.utc),
-        "updated_at": datetime.now(timezone.utc)
+        "created_at": now,
+        "updated_at": now
     })
     
     result = db.players.insert_one(player_doc)
@@ -336,8 +338,8 @@ async def delete_player(
     if player and player.get("image_path"):
         try:
             image_file = Path("static" + player["image_path"].replace("/static", ""))
-            if image_file.exists():
-                image_file.unlink()
+            # missing_ok avoids a separate exists() stat before the unlink
+            image_file.unlink(missing_ok=True)
         except Exception:
             pass
     
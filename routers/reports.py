@@ -9,6 +9,7 @@ from datetime import datetime
 
 from database import db
 from core.security import require_admin
+from services.bid_service import BidService
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -32,29 +33,33 @@ async def export_sold_players(
             detail="Export functionality requires pandas and openpyxl"
         )
     
-    # Get sold players
-    players = list(db.players.find({"status": "sold"}))
+    # Stream sold players, fetching only the exported fields
+    players = db.players.find(
+        {"status": "sold"},
+        {"name": 1, "category": 1, "base_price": 1, "final_bid": 1, "final_team": 1,
+         "affiliation_role": 1, "age": 1, "batting_style": 1, "bowling_style": 1}
+    )
     
-    if not players:
-        raise HTTPException(status_code=404, detail="No sold players found")
+    team_names = BidService.lookup_names(db.teams, db.players.distinct("final_team", {"status": "sold"}))
     
     # Prepare data
     data = []
     for p in players:
-        team = db.teams.find_one({"_id": p.get("final_team")}) if p.get("final_team") else None
-        
         data.append({
             "Player Name": p.get("name"),
             "Category": p.get("category"),
             "Base Price": p.get("base_price"),
             "Final Bid": p.get("final_bid"),
-            "Team": team.get("name") if team else "N/A",
+            "Team": team_names.get(p.get("final_team")) or "N/A",
             "Affiliation": p.get("affiliation_role"),
             "Age": p.get("age"),
             "Batting Style": p.get("batting_style"),
             "Bowling Style": p.get("bowling_style")
         })
     
+    if not data:
+        raise HTTPException(status_code=404, detail="No sold players found")
+    
     df = pd.DataFrame(data)
     
     # Generate file
@@ -95,12 +100,14 @@ async def export_team_summary(
             detail="Export functionality requires pandas and openpyxl"
         )
     
-    teams = list(db.teams.find({}))
+    teams = db.teams.find({}, {"name": 1, "owner": 1, "budget": 1})
     
     data = []
     for team in teams:
         team_id = str(team["_id"])
-        players = list(db.players.find({"final_team": team_id, "status": "sold"}))
+        players = list(db.players.find(
+            {"final_team": team_id, "status": "sold"}, {"final_bid": 1, "_id": 0}
+        ))
         
         total_spent = sum(p.get("final_bid", 0) for p in players)
         
@@ -152,22 +159,24 @@ async def export_auction_summary(
             detail="Export functionality requires pandas and openpyxl"
         )
     
-    # Get all players
-    players = list(db.players.find({}))
+    # Stream all players, fetching only the exported fields
+    players = db.players.find(
+        {},
+        {"name": 1, "category": 1, "base_price": 1, "status": 1,
+         "final_bid": 1, "final_team": 1, "affiliation_role": 1}
+    )
+    
+    team_names = BidService.lookup_names(db.teams, db.players.distinct("final_team"))
     
     data = []
     for p in players:
-        team = None
-        if p.get("final_team"):
-            team = db.teams.find_one({"_id": p.get("final_team")})
-        
         data.append({
             "Player Name": p.get("name"),
             "Category": p.get("category"),
             "Base Price": p.get("base_price"),
             "Status": p.get("status"),
             "Final Bid": p.get("final_bid") if p.get("status") == "sold" else "N/A",
-            "Team": team.get("name") if team else "N/A",
+            "Team": team_names.get(p.get("final_team")) or "N/A",
             "Affiliation": p.get("affiliation_role")
         })
     
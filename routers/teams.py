@@ -6,6 +6,9 @@ from fastapi import APIRouter, HTTPException, Depends, Form, File, UploadFile, s
 from typing import List, Optional
 from datetime import datetime, timezone
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import asyncio
 import logging
 
 from database import db
@@ -20,14 +23,20 @@ logger = logging.getLogger(__name__)
 async def list_teams():
     """List all teams with statistics."""
     try:
-        teams = list(db.teams.find())
+        # Stream teams, fetching only the fields returned (never the password hash)
+        teams = db.teams.find({}, {
+            "name": 1, "username": 1, "logo_path": 1, "budget": 1,
+            "created_at": 1, "updated_at": 1
+        })
         result = []
         
         for team in teams:
             team_id = str(team["_id"])
             
             # Calculate statistics
-            players = list(db.players.find({"final_team": team_id, "status": "sold"}))
+            players = list(db.players.find(
+                {"final_team": team_id, "status": "sold"}, {"final_bid": 1, "_id": 0}
+            ))
             total_spent = sum(p.get("final_bid", 0) for p in players)
             players_count = len(players)
             highest_purchase = max([p.get("final_bid", 0) for p in players], default=0)
@@ -118,23 +127,30 @@ async def create_team(
         username = username.strip().lower()
         
         # Check for duplicate username
-        existing = db.teams.find_one({"username": username})
+        existing = db.teams.find_one({"username": username}, {"_id": 1})
         if existing:
             raise HTTPException(status_code=400, detail=f"Username '{username}' already exists")
         
+        # Hash off the event loop (bcrypt releases the GIL)
+        hashed_password = await asyncio.to_thread(hash_password, password)
+        
         # Create team document
+        now = datetime.now(timezone.utc)
         team_doc = {
             "name": name.strip(),
             "username": username,
-            "hashed_password": hash_password(password),
+            "hashed_password": hashed_password,
             "budget": float(budget),
             "logo_path": logo_path.strip() if logo_path else "",
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
+            "created_at": now,
+            "updated_at": now
         }
         
-        # Insert into database
-        result = db.teams.insert_one(team_doc)
+        # Insert into database (unique index rejects concurrent duplicates)
+        try:
+            result = db.teams.insert_one(team_doc)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail=f"Username '{username}' already exists")
         team_id = str(result.inserted_id)
         
         logger.info(f"Team created successfully: {name} (ID: {team_id})")
@@ -194,7 +210,7 @@ async def update_team(
         if username:
             username = username.strip().lower()
             # Check for duplicate username (excluding current team)
-            existing = db.teams.find_one({"username": username, "_id": {"$ne": tid}})
+            existing = db.teams.find_one({"username": username, "_id": {"$ne": tid}}, {"_id": 1})
             if existing:
                 raise HTTPException(status_code=400, detail=f"Username '{username}' already exists")
             update_data["username"] = username
@@ -202,14 +218,16 @@ async def update_team(
         if password:
             if len(password) < 6:
                 raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
-            update_data["hashed_password"] = hash_password(password)
+            update_data["hashed_password"] = await asyncio.to_thread(hash_password, password)
         
         if budget is not None:
             if budget < 0:
                 raise HTTPException(status_code=400, detail="Budget cannot be negative")
             
             # Calculate total spent
-            players = list(db.players.find({"final_team": team_id, "status": "sold"}))
+            players = db.players.find(
+                {"final_team": team_id, "status": "sold"}, {"final_bid": 1, "_id": 0}
+            )
             total_spent = sum(p.get("final_bid", 0) for p in players)
             
             if budget < total_spent:
@@ -229,16 +247,23 @@ async def update_team(
         # Add updated timestamp
         update_data["updated_at"] = datetime.now(timezone.utc)
         
-        # Update in database
-        result = db.teams.update_one({"_id": tid}, {"$set": update_data})
+        # Update in database, reading back the fields the broadcast needs
+        try:
+            updated_team = db.teams.find_one_and_update(
+                {"_id": tid},
+                {"$set": update_data},
+                projection={"name": 1, "budget": 1},
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail=f"Username '{username}' already exists")
         
-        if result.matched_count == 0:
+        if updated_team is None:
             raise HTTPException(status_code=404, detail="Team not found")
         
         logger.info(f"Team updated successfully: {team_id}")
         
         # Broadcast team update to all clients
-        updated_team = db.teams.find_one({"_id": tid})
         await manager.broadcast_team_update({
             "team_id": team_id,
             "team_name": updated_team.get("name"),
@@ -274,11 +299,11 @@ async def delete_team(
             raise HTTPException(status_code=400, detail="Invalid team ID")
         
         # Check if team has purchased players
-        players = list(db.players.find({"final_team": team_id, "status": "sold"}))
-        if players:
+        purchased_count = db.players.count_documents({"final_team": team_id, "status": "sold"})
+        if purchased_count:
             raise HTTPException(
                 status_code=400,
-                detail=f"Cannot delete team with {len(players)} purchased players. Remove players first."
+                detail=f"Cannot delete team with {purchased_count} purchased players. Remove players first."
             )
         
         # Delete team
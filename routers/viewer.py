@@ -9,16 +9,18 @@ from typing import Optional
 from datetime import datetime
 from bson import ObjectId
 
+from core.config import settings
 from database import db
 
 router = APIRouter(prefix="/viewer", tags=["Viewer"])
 templates = Jinja2Templates(directory="templates")
+templates.env.auto_reload = settings.DEBUG
 
 
 @router.get("/live", response_class=HTMLResponse)
 async def live_viewer(request: Request):
     """Live auction viewer dashboard"""
-    return templates.TemplateResponse("live_studio.html", {"request": request})
+    return templates.TemplateResponse(request, "live_studio.html")
 
 
 @router.get("/analytics")
@@ -31,19 +33,20 @@ async def get_viewer_analytics():
         # Get auction config
         config = db.config.find_one({"key": "auction"}) or {}
         
-        # Count players by status
-        total_players = db.players.count_documents({})
-        sold_players = db.players.count_documents({"status": "sold"})
-        unsold_players = db.players.count_documents({"status": "unsold"})
-        available_players = db.players.count_documents({"status": "available"})
-        
-        # Calculate total revenue
-        pipeline = [
-            {"$match": {"status": "sold", "final_bid": {"$exists": True}}},
-            {"$group": {"_id": None, "total": {"$sum": "$final_bid"}}}
+        # Count players and sum bids by status in a single pass
+        total_players = db.players.estimated_document_count()
+        status_pipeline = [
+            {"$group": {
+                "_id": "$status",
+                "count": {"$sum": 1},
+                "revenue": {"$sum": "$final_bid"}
+            }}
         ]
-        revenue_result = list(db.players.aggregate(pipeline))
-        total_revenue = revenue_result[0]["total"] if revenue_result else 0
+        by_status = {s["_id"]: s for s in db.players.aggregate(status_pipeline)}
+        sold_players = by_status.get("sold", {}).get("count", 0)
+        unsold_players = by_status.get("unsold", {}).get("count", 0)
+        available_players = by_status.get("available", {}).get("count", 0)
+        total_revenue = by_status.get("sold", {}).get("revenue", 0)
         
         # Find most expensive player
         most_expensive = db.players.find_one(
@@ -58,23 +61,24 @@ async def get_viewer_analytics():
                 "_id": "$final_team",
                 "total_spent": {"$sum": "$final_bid"},
                 "players_count": {"$sum": 1}
-            }},
-            {"$sort": {"total_spent": -1}}
+            }}
         ]
-        team_spending = list(db.players.aggregate(team_pipeline))
+        team_spending = {
+            str(t["_id"]): t for t in db.players.aggregate(team_pipeline)
+        }
         
         # Get all teams with remaining purse
         teams = list(db.teams.find({}, {"name": 1, "budget": 1, "initial_budget": 1}))
         teams_data = []
         for team in teams:
             team_id = str(team["_id"])
-            spent = next((t["total_spent"] for t in team_spending if str(t["_id"]) == team_id), 0)
+            spending = team_spending.get(team_id, {})
             teams_data.append({
                 "team_id": team_id,
                 "name": team["name"],
                 "remaining_purse": team.get("budget", 0),
-                "total_spent": spent,
-                "players_count": next((t["players_count"] for t in team_spending if str(t["_id"]) == team_id), 0)
+                "total_spent": spending.get("total_spent", 0),
+                "players_count": spending.get("players_count", 0)
             })
         
         # Sort teams by spending
@@ -14,6 +14,12 @@ console.log('Admin.js loaded!');
 console.log('Access token:', localStorage.getItem("access_token") ? 'Present' : 'Missing');
 
 function getAccess() { return localStorage.getItem("access_token"); }
+
+// Live monitor polling: base interval plus jitter so open admin panels don't
+// refresh in lockstep; the server raises it via X-Poll-Interval when saturated
+const LIVE_MONITOR_INTERVAL_MS = 5000;
+const LIVE_MONITOR_JITTER_MS = 1500;
+let pollIntervalHint = null;
 function logout() {
     localStorage.removeItem("access_token");
     localStorage.removeItem("refresh_token");
@@ -108,6 +114,7 @@ async function api(url, options = {}) {
         }
     }
     
+    pollIntervalHint = Number(response.headers.get('X-Poll-Interval')) || null;
     return response;
 }
 
@@ -864,8 +871,15 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 });
 
-// Auto-refresh live monitor every 5 seconds (reduced from 30)
-setInterval(loadLiveMonitor, 5000);
+// Auto-refresh live monitor every ~5 seconds (reduced from 30)
+function scheduleLiveMonitor() {
+    const interval = Math.max(LIVE_MONITOR_INTERVAL_MS, pollIntervalHint || 0);
+    setTimeout(async () => {
+        await loadLiveMonitor();
+        scheduleLiveMonitor();
+    }, interval + Math.random() * LIVE_MONITOR_JITTER_MS);
+}
+scheduleLiveMonitor();
 
 
 /* ============================================================
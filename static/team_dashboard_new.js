@@ -10,6 +10,12 @@ let allPlayers = [];
 let ws = null;
 let charts = {};
 
+// Polling: base interval plus jitter so open dashboards don't refresh in lockstep;
+// the server raises the interval via X-Poll-Interval when it is saturated
+const POLL_INTERVAL_MS = 3000;
+const POLL_JITTER_MS = 1000;
+let pollIntervalHint = null;
+
 // Get authentication
 const token = localStorage.getItem('access_token');
 const teamId = localStorage.getItem('team_id');
@@ -87,24 +93,36 @@ async function api(url, options = {}) {
         }
     }
     
+    pollIntervalHint = Number(response.headers.get('X-Poll-Interval')) || null;
     return response;
 }
 
 // Initialize dashboard
 async function init() {
     console.log('Initializing Team Dashboard...');
+    // Team data first: the other panels read teamData, and a token refresh
+    // triggered here is then shared by the requests that follow
     await loadTeamData();
-    await loadMyPlayers();
-    await loadAllPlayers();
-    await loadAuctionStatus();
+    await Promise.all([
+        loadMyPlayers(),
+        loadAllPlayers(),
+        loadAuctionStatus()
+    ]);
     connectWebSocket();
     initCharts();
     
-    // Auto-refresh every 3 seconds (reduced from 5)
-    setInterval(async () => {
+    // Auto-refresh every ~3 seconds (reduced from 5)
+    scheduleRefresh();
+}
+
+// Schedule the next auto-refresh, honoring the server's back-off hint
+function scheduleRefresh() {
+    const interval = Math.max(POLL_INTERVAL_MS, pollIntervalHint || 0);
+    setTimeout(async () => {
         await loadTeamData();
         await loadAuctionStatus();
-    }, 3000);
+        scheduleRefresh();
+    }, interval + Math.random() * POLL_JITTER_MS);
 }
 
 // Load team data
@@ -678,8 +696,10 @@ function connectWebSocket() {
                 
             case 'player_sold':
                 await loadTeamData();
-                await loadMyPlayers();
-                await loadAuctionStatus();
+                await Promise.all([
+                    loadMyPlayers(),
+                    loadAuctionStatus()
+                ]);
                 
                 if (data.data && data.data.team_id === teamId) {
                     showToast('Player Acquired!', `You won ${data.data.player_name} for ₹${data.data.final_bid.toLocaleString()}`, 'success');
@@ -715,8 +735,10 @@ function connectWebSocket() {
             case 'player_undo':
                 // Handle undo event - refresh team data and players
                 await loadTeamData();
-                await loadMyPlayers();
-                await loadAuctionStatus();
+                await Promise.all([
+                    loadMyPlayers(),
+                    loadAuctionStatus()
+                ]);
                 
                 if (data.data && data.data.team_id === teamId) {
                     showToast('Sale Undone', `${data.data.player_name} removed from your roster. ₹${data.data.refund_amount.toLocaleString()} refunded.`, 'warning');
@@ -726,9 +748,11 @@ function connectWebSocket() {
             case 'auction_reset':
                 // Handle auction reset
                 await loadTeamData();
-                await loadMyPlayers();
-                await loadAllPlayers();
-                await loadAuctionStatus();
+                await Promise.all([
+                    loadMyPlayers(),
+                    loadAllPlayers(),
+                    loadAuctionStatus()
+                ]);
                 showToast('Auction Reset', 'The auction has been reset by admin', 'warning');
                 break;
                 
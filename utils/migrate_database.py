@@ -2,7 +2,6 @@
 Database migration script.
 Adds new fields to existing player documents without breaking data.
 """
-from pymongo import MongoClient
 from datetime import datetime, timezone
 import sys
 import os
@@ -10,21 +9,45 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from pymongo import IndexModel, MongoClient, UpdateOne
+
 from core.config import settings
 
+# Updates are sent to the server in bulk_write batches of this size
+BULK_BATCH_SIZE = 100
+
+
+def create_client() -> MongoClient:
+    """
+    Build the migration's MongoDB client.
+    A one-shot script issues its commands sequentially, so it gets a small
+    client of its own instead of the app's warm 200-connection pool.
+    """
+    return MongoClient(
+        settings.mongodb_url,
+        maxPoolSize=2,
+        serverSelectionTimeoutMS=5000,
+        socketTimeoutMS=10000,
+        retryWrites=True,
+        w=1,
+        compressors=settings.mongodb_compressors
+    )
 
-def migrate_players():
+
+def migrate_players(db):
     """Migrate player documents to add new fields."""
-    client = MongoClient(settings.DATABASE_URL)
-    db = client[settings.DB_NAME]
-    
     print("🔄 Starting player migration...")
     
-    # Get all players
-    players = list(db.players.find({}))
-    print(f"📊 Found {len(players)} players")
+    # Stream players, fetching only the fields the migration inspects
+    print(f"📊 Found {db.players.estimated_document_count()} players")
+    players = db.players.find(
+        {},
+        {"role": 1, "category": 1, "affiliation_role": 1, "image_path": 1,
+         "auction_round": 1, "updated_at": 1, "created_at": 1}
+    ).batch_size(500)
     
     updated_count = 0
+    ops = []
     
     for player in players:
         update_fields = {}
@@ -64,33 +87,35 @@ def migrate_players():
         if "updated_at" not in player:
             update_fields["updated_at"] = player.get("created_at", datetime.now(timezone.utc))
         
-        # Update if there are fields to add
+        # Queue an update if there are fields to add
         if update_fields:
-            db.players.update_one(
-                {"_id": player["_id"]},
-                {"$set": update_fields}
-            )
+            ops.append(UpdateOne({"_id": player["_id"]}, {"$set": update_fields}))
             updated_count += 1
+            
+            if len(ops) >= BULK_BATCH_SIZE:
+                db.players.bulk_write(ops, ordered=False)
+                ops = []
+    
+    if ops:
+        db.players.bulk_write(ops, ordered=False)
     
     print(f"✅ Updated {updated_count} players")
     
     # Create indexes
     print("🔄 Creating indexes...")
-    db.players.create_index("role")
-    db.players.create_index("category")
-    db.players.create_index("status")
-    db.players.create_index("auction_round")
+    db.players.create_indexes([
+        IndexModel("role"),
+        IndexModel("category"),
+        IndexModel("status"),
+        IndexModel([("auction_round", 1), ("status", 1)])
+    ])
     print("✅ Indexes created")
     
-    client.close()
     print("✨ Migration complete!")
 
 
-def migrate_auction_config():
+def migrate_auction_config(db):
     """Add auction_round to config."""
-    client = MongoClient(settings.DATABASE_URL)
-    db = client[settings.DB_NAME]
-    
     print("🔄 Migrating auction config...")
     
     config = db.config.find_one({"key": "auction"})
@@ -102,20 +127,21 @@ def migrate_auction_config():
         print("✅ Auction config updated")
     else:
         print("ℹ️  Auction config already up to date")
-    
-    client.close()
 
 
-if __name__ == "__main__":
+def main():
+    """Run all migrations, closing the client when done."""
     print("=" * 50)
     print("🏏 Cricket Auction Database Migration")
     print("=" * 50)
     print()
     
+    client = create_client()
     try:
-        migrate_players()
+        db = client[settings.DB_NAME]
+        migrate_players(db)
         print()
-        migrate_auction_config()
+        migrate_auction_config(db)
         print()
         print("=" * 50)
         print("✅ All migrations completed successfully!")
@@ -125,3 +151,9 @@ if __name__ == "__main__":
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()